@@ -0,0 +1,134 @@
+"""
+Offline batch converter: parse a directory of exam PDFs, .docx and text files.
+
+    python batch_convert.py exams/ -o questions.jsonl --scripts-dir scripts/ --jobs 8
+
+Each file becomes one JSON line ({"file", "ok", "questions", ...}) written as
+soon as it finishes. A file that fails is reported and skipped; the rest of
+the batch carries on.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from parser import parse_questions
+from pdf_extractor import extract_pdf_pages, BACKENDS
+from ingest import detect_kind, iter_document_text
+from professional_script_generator import generate_simple_apps_script
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+def find_exam_files(directory, recursive=False):
+    """Sorted paths of the supported exam files in directory"""
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+        if not recursive:
+            break
+    return sorted(paths)
+
+def convert_file(path, scripts_dir=None, time_budget=None, backend=None):
+    """Extract, parse and optionally script one file. Runs in a worker process
+    and never raises: failures come back as {"ok": False, "error": ...}."""
+    start = time.perf_counter()
+    result = {"file": path, "ok": False}
+    try:
+        # The parser's debug output must not end up in a JSONL stream on stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            if path.lower().endswith('.pdf'):
+                # Files are already spread over the pool; keep each PDF serial
+                pages = extract_pdf_pages(path, workers=1, backend=backend)
+                result["pages"] = len(pages)
+                text = '\n'.join(pages)
+            else:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                text = ''.join(iter_document_text(data, detect_kind(file_name=path)))
+            result["chars"] = len(text)
+
+            questions = parse_questions(text, time_budget=time_budget)
+            result["questions"] = [question.to_dict() for question in questions]
+
+            if scripts_dir:
+                title = os.path.splitext(os.path.basename(path))[0]
+                script_path = os.path.join(scripts_dir, f"{title}.gs")
+                with open(script_path, 'w', encoding='utf-8') as f:
+                    f.write(generate_simple_apps_script(questions, title))
+                result["script"] = script_path
+
+        result["ok"] = True
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+def _report(result):
+    name = os.path.basename(result["file"])
+    if not result["ok"]:
+        print(f"❌ {name}: {result['error']}", file=sys.stderr)
+        return
+    count = len(result["questions"])
+    seconds = max(result["seconds"], 1e-6)
+    pages = f", {result['pages']} pages ({result['pages'] / seconds:.1f} pages/s)" if "pages" in result else ""
+    print(f"✅ {name}: {count} questions in {seconds:.2f}s ({count / seconds:.0f} q/s{pages})", file=sys.stderr)
+
+def run_batch(paths, output, scripts_dir=None, jobs=None, time_budget=None, backend=None):
+    """Convert paths on a process pool, streaming JSON lines to output.
+    Returns the number of failed files."""
+    if scripts_dir:
+        os.makedirs(scripts_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    failed = 0
+    total_questions = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(convert_file, path, scripts_dir, time_budget, backend) for path in paths]
+        for future in as_completed(futures):
+            result = future.result()
+            _report(result)
+            output.write(json.dumps(result, ensure_ascii=False) + '\n')
+            output.flush()
+            if result["ok"]:
+                total_questions += len(result["questions"])
+            else:
+                failed += 1
+
+    elapsed = max(time.perf_counter() - start, 1e-6)
+    print(
+        f"\n📊 {len(paths) - failed}/{len(paths)} files converted, {total_questions} questions "
+        f"in {elapsed:.2f}s ({len(paths) / elapsed:.2f} files/s, {total_questions / elapsed:.0f} q/s)",
+        file=sys.stderr
+    )
+    return failed
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Convert a directory of exam PDF/.docx/text files to questions")
+    arg_parser.add_argument("directory", help="directory containing .pdf, .docx and .txt exam files")
+    arg_parser.add_argument("-o", "--output", default="-", help="JSONL output file ('-' for stdout)")
+    arg_parser.add_argument("--scripts-dir", help="also write one Google Apps Script per file here")
+    arg_parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    arg_parser.add_argument("-r", "--recursive", action="store_true", help="include subdirectories")
+    arg_parser.add_argument("--time-budget", type=float, default=None, help="max parse seconds per file")
+    arg_parser.add_argument("--backend", choices=list(BACKENDS), default=None, help="PDF text backend (default: pypdf2)")
+    args = arg_parser.parse_args(argv)
+
+    paths = find_exam_files(args.directory, args.recursive)
+    if not paths:
+        print(f"❌ No {'/'.join(SUPPORTED_EXTENSIONS)} files found in {args.directory}", file=sys.stderr)
+        return 1
+
+    if args.output == "-":
+        failed = run_batch(paths, sys.stdout, args.scripts_dir, args.jobs, args.time_budget, args.backend)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            failed = run_batch(paths, output, args.scripts_dir, args.jobs, args.time_budget, args.backend)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
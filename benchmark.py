@@ -0,0 +1,382 @@
+"""
+Benchmarks for the exam bot.
+
+    python benchmark.py redos      # adversarial parser corpus, checks cost stays linear
+    python benchmark.py pdf        # PDF text backends: speed, memory and questions recovered
+    python benchmark.py clients    # Google API client setup cost, per call vs. long-lived
+    python benchmark.py forms --template ID   # form creation from scratch vs. template copy (real API)
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+from parser import parse_questions, ParseTimeoutError, QuestionType
+
+# ---------------------------------------------------------------------------
+# Adversarial parser corpus. Each builder returns a document of roughly `size`
+# characters aimed at a known backtracking hot spot of the old regex parser.
+# Every document opens with an intro line: the legacy parser only splits on a
+# number that follows a newline, so without one it would never reach the
+# choice regexes at all.
+# ---------------------------------------------------------------------------
+
+INTRO = "Practice exam\n"
+
+def _choices_without_d(size):
+    # Long choice block that never reaches a D. marker (old pattern1)
+    filler = "a " * (size // 6)
+    return f"{INTRO}1. Which one?\nA. {filler}B. {filler}C. {filler}"
+
+def _marker_flood(size):
+    # Every few characters looks like a choice marker
+    return INTRO + "1. Which one?\n" + "A. a. B) b. " * (size // 12)
+
+def _lowercase_a_flood(size):
+    # IGNORECASE made every 'a' a candidate start for the old A\. patterns
+    return INTRO + "1. Which one?\nA." + "a" * size
+
+def _digit_run_answer_key(size):
+    # (\d+)\. restarted inside a long digit run
+    return INTRO + "1. Which one?\nA. x B. y\nAnswer Key: " + "1" * size
+
+def _whitespace_run(size):
+    # \n\s*(\d+)\. restarted inside a long blank run
+    return INTRO + "1. Which one?\nA. x B. y\n" + "\n \t" * (size // 3) + "x"
+
+def _many_questions(size):
+    block = "{n}. Question {n}?\nA. one B. two C. three D. four\n"
+    count = size // len(block.format(n=100))
+    return INTRO + "".join(block.format(n=n) for n in range(1, count + 1))
+
+ADVERSARIAL_CORPUS = {
+    "choices_without_d": _choices_without_d,
+    "marker_flood": _marker_flood,
+    "lowercase_a_flood": _lowercase_a_flood,
+    "digit_run_answer_key": _digit_run_answer_key,
+    "whitespace_run": _whitespace_run,
+    "many_questions": _many_questions,
+}
+
+def _time_parse(text, legacy, time_budget):
+    """Time one parse, swallowing the parser's debug output"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            parse_questions(text, legacy=legacy, time_budget=time_budget)
+        except ParseTimeoutError:
+            return None
+        except ValueError:
+            pass
+    return time.perf_counter() - start
+
+def run_redos(args):
+    """Parse every corpus entry at doubling sizes and report the growth factor.
+
+    A linear parser roughly doubles its time when the input doubles; anything
+    well above that means backtracking crept back in.
+    """
+    sizes = [args.base_size * 2 ** step for step in range(args.steps)]
+    worst_growth = 0.0
+
+    print(f"{'case':<24}{'path':<8}" + "".join(f"{size:>12,}" for size in sizes) + f"{'growth':>10}")
+    for name, build in ADVERSARIAL_CORPUS.items():
+        for legacy in (False, True):
+            timings = [_time_parse(build(size), legacy, args.budget) for size in sizes]
+            cells = "".join(f"{'timeout':>12}" if t is None else f"{t * 1000:>10.1f}ms" for t in timings)
+            growth = "-"
+            if all(t is not None for t in timings):
+                # Average factor per doubling, ignoring timer noise on tiny inputs
+                factor = (max(timings[-1], 1e-4) / max(timings[0], 1e-4)) ** (1 / (len(timings) - 1))
+                growth = f"{factor:.2f}x"
+                if not legacy:
+                    worst_growth = max(worst_growth, factor)
+            print(f"{name:<24}{'legacy' if legacy else 'scan':<8}{cells}{growth:>10}")
+
+    print(f"\nWorst scanner growth per doubling: {worst_growth:.2f}x (linear ~ 2.0x)")
+    if worst_growth > args.max_growth:
+        print(f"❌ Scanner growth exceeds {args.max_growth}x")
+        return 1
+    print("✅ Scanner cost stays linear on the adversarial corpus")
+    return 0
+
+# ---------------------------------------------------------------------------
+# PDF backend corpus. PDFs are written by hand (one Helvetica text stream per
+# page) so the benchmark needs nothing beyond the backends it measures.
+# ---------------------------------------------------------------------------
+
+LINES_PER_PAGE = 50
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def build_pdf(pages) -> bytes:
+    """Minimal PDF with one page per list of text lines"""
+    page_count = len(pages)
+    # 1 catalog, 2 page tree, 3 font, then a page and a content stream per page
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(page_count))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for i, lines in enumerate(pages):
+        shown = " ".join(f"({_pdf_escape(line)}) Tj T*" for line in lines)
+        stream = f"BT /F1 11 Tf 14 TL 50 780 Td {shown} ET".encode('latin-1', 'replace')
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+def _exam_lines(question_count, inline_choices):
+    """Numbered MCQs plus an answer key; inline_choices puts A-D on one line"""
+    letters = "ABCD"
+    lines = []
+    for n in range(1, question_count + 1):
+        lines.append(f"{n}. Which option best completes statement number {n} of this exam?")
+        options = [f"{letter}. option {letter.lower()} for question {n}" for letter in letters]
+        if inline_choices:
+            lines.append(" ".join(options))
+        else:
+            lines.extend(options)
+    key = [f"{n}. {letters[n % 4]}" for n in range(1, question_count + 1)]
+    lines.append("Answer Key:")
+    lines.extend(" ".join(key[i:i + 10]) for i in range(0, len(key), 10))
+    return lines
+
+def _paginate(lines):
+    return [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+
+def pdf_corpus(question_counts):
+    """(name, pdf bytes, expected MCQ count) for each size and layout"""
+    for count in question_counts:
+        for inline in (False, True):
+            name = f"{count}q-{'inline' if inline else 'lines'}"
+            yield name, build_pdf(_paginate(_exam_lines(count, inline))), count
+
+def _bench_backend(backend, pdf):
+    """Extract and parse pdf; returns (pages, seconds, peak python MB, MCQs found)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    pages = list(backend.iter_pages(pdf, 0, backend.page_count(pdf)))
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            questions = parse_questions('\n'.join(pages))
+        except ValueError:
+            questions = []
+    found = sum(1 for q in questions if q.type == QuestionType.MULTIPLE_CHOICE)
+    return len(pages), seconds, peak / (1024 * 1024), found
+
+def run_pdf(args):
+    """Run every installed PDF backend over the generated corpus"""
+    # Imported here so the parser benchmarks run without PyPDF2 installed
+    from pdf_extractor import BACKENDS, available_backends
+
+    names = args.backend or available_backends()
+    missing = [name for name in names if name not in BACKENDS or not BACKENDS[name].available()]
+    if missing:
+        print(f"❌ Backend(s) not available: {', '.join(missing)} (installed: {', '.join(available_backends())})")
+        return 1
+
+    corpus = list(pdf_corpus(args.questions))
+    print("Memory is the peak of Python allocations; native backends allocate mostly outside it.\n")
+    print(f"{'backend':<12}{'document':<16}{'pages':>7}{'seconds':>10}{'pages/s':>10}{'peak MB':>9}{'MCQs':>12}")
+    failed = False
+    for name in names:
+        backend = BACKENDS[name]
+        for document, pdf, expected in corpus:
+            try:
+                pages, seconds, peak_mb, found = _bench_backend(backend, pdf)
+            except Exception as e:
+                print(f"{name:<12}{document:<16}  ❌ {type(e).__name__}: {e}")
+                failed = True
+                continue
+            rate = pages / max(seconds, 1e-6)
+            print(f"{name:<12}{document:<16}{pages:>7}{seconds:>10.3f}{rate:>10.1f}{peak_mb:>9.1f}{f'{found}/{expected}':>12}")
+    return 1 if failed else 0
+
+# ---------------------------------------------------------------------------
+# Google API client setup. Only local work is timed (credential loading and
+# building services from discovery documents); no request leaves the process.
+# ---------------------------------------------------------------------------
+
+def _dummy_credentials():
+    """Service-account credentials with a throwaway key and a fake valid token"""
+    import datetime
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from google.oauth2.service_account import Credentials
+    from google_clients import SCOPES
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    info = {
+        "type": "service_account",
+        "client_email": "benchmark@example.iam.gserviceaccount.com",
+        "private_key": pem,
+        "private_key_id": "benchmark",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }
+    credentials = Credentials.from_service_account_info(info, scopes=SCOPES)
+    credentials.token = "benchmark-token"
+    credentials.expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(hours=1)
+    return info, credentials
+
+def run_clients(args):
+    """Compare per-call client setup (the old path) with the long-lived clients"""
+    from google.oauth2.service_account import Credentials
+    from googleapiclient.discovery import build
+    import google_clients
+
+    info, credentials = _dummy_credentials()
+    google_clients.set_credentials(credentials)
+
+    def per_call():
+        # What every create_google_form / get_form_responses call used to do
+        creds = Credentials.from_service_account_info(info, scopes=google_clients.SCOPES)
+        build('forms', 'v1', credentials=creds)
+        build('drive', 'v3', credentials=creds)
+
+    def long_lived():
+        google_clients.forms_service()
+        google_clients.drive_service()
+
+    print(f"{'setup':<14}{'first call':>14}{'per call after':>18}")
+    results = {}
+    for name, setup in (("per-call", per_call), ("long-lived", long_lived)):
+        start = time.perf_counter()
+        setup()
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            setup()
+        results[name] = (time.perf_counter() - start) / args.calls
+        print(f"{name:<14}{first * 1000:>12.2f}ms{results[name] * 1000:>16.3f}ms")
+
+    saved = results["per-call"] - results["long-lived"]
+    print(f"\nSetup saved per form after warm-up: {saved * 1000:.2f}ms "
+          f"({results['per-call'] / max(results['long-lived'], 1e-9):,.0f}x less)")
+    return 0
+
+# ---------------------------------------------------------------------------
+# Form creation paths. Runs against the real Forms/Drive APIs with the bot's
+# service account, creating (and by default deleting) real forms.
+# ---------------------------------------------------------------------------
+
+async def _time_form_paths(questions, args):
+    from google_forms_async import create_google_form_async, get_client, close_client
+
+    modes = {"scratch": None, "template": args.template}
+    timings = {mode: [] for mode in modes}
+    created = []
+    try:
+        for run in range(args.runs):
+            for mode, template_id in modes.items():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = await create_google_form_async(
+                        questions, f"Benchmark {mode} {run + 1}", template_id=template_id
+                    )
+                if result.get("form_id"):
+                    created.append(result["form_id"])
+                if not result["success"]:
+                    print(f"❌ {mode}: {result['error']}")
+                    return None
+                timings[mode].append(result["timings"])
+    finally:
+        if not args.keep:
+            client = get_client()
+            for form_id in created:
+                try:
+                    await client.delete_file(form_id)
+                except Exception as e:
+                    print(f"⚠️ Could not delete form {form_id}: {e}")
+        await close_client()
+    return timings
+
+def run_forms(args):
+    """Time create_google_form_async from scratch and from a template copy"""
+    import asyncio
+
+    if not args.template:
+        print("❌ Pass --template or set FORM_TEMPLATE_ID to a form with no questions")
+        return 1
+
+    letters = "ABCD"
+    text = "\n".join(
+        f"{n}. Benchmark question {n}?\n" + " ".join(f"{letter}. option {letter}" for letter in letters)
+        for n in range(1, args.questions + 1)
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        questions = parse_questions(text, time_budget=None)
+
+    timings = asyncio.run(_time_form_paths(questions, args))
+    if timings is None:
+        return 1
+
+    steps = ("create", "update", "share", "total")
+    print(f"{args.questions} questions, mean of {args.runs} run(s), seconds\n")
+    print(f"{'path':<10}" + "".join(f"{step:>9}" for step in steps))
+    means = {}
+    for mode, runs in timings.items():
+        means[mode] = {step: sum(run[step] for run in runs) / len(runs) for step in steps}
+        print(f"{mode:<10}" + "".join(f"{means[mode][step]:>9.2f}" for step in steps))
+    saved = means["scratch"]["total"] - means["template"]["total"]
+    print(f"\nTemplate copy saves {saved:.2f}s per form ({saved / max(means['scratch']['total'], 1e-9):.0%})")
+    return 0
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Exam bot benchmarks")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    redos = commands.add_parser("redos", help="adversarial parser corpus")
+    redos.add_argument("--base-size", type=int, default=25_000, help="smallest document size in characters")
+    redos.add_argument("--steps", type=int, default=4, help="number of size doublings")
+    redos.add_argument("--budget", type=float, default=None, help="per-document time budget in seconds")
+    redos.add_argument("--max-growth", type=float, default=3.0, help="fail above this growth per doubling")
+    redos.set_defaults(func=run_redos)
+
+    pdf = commands.add_parser("pdf", help="PDF text backends on generated exam PDFs")
+    pdf.add_argument("--backend", action="append", help="backend to run (repeatable; default: all installed)")
+    pdf.add_argument("--questions", type=int, nargs="+", default=[50, 400, 2000],
+                     help="questions per generated document")
+    pdf.set_defaults(func=run_pdf)
+
+    clients = commands.add_parser("clients", help="Google API client setup cost")
+    clients.add_argument("--calls", type=int, default=50, help="calls to average over")
+    clients.set_defaults(func=run_clients)
+
+    forms = commands.add_parser("forms", help="form creation from scratch vs. template copy (real API)")
+    forms.add_argument("--template", default=os.getenv('FORM_TEMPLATE_ID'), help="template form id")
+    forms.add_argument("--questions", type=int, default=50, help="questions per form")
+    forms.add_argument("--runs", type=int, default=3, help="forms created per path")
+    forms.add_argument("--keep", action="store_true", help="keep the created forms instead of deleting them")
+    forms.set_defaults(func=run_forms)
+
+    args = arg_parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
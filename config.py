@@ -4,4 +4,57 @@ import os
 load_dotenv()
 
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
-BOT_CREATOR = "Anon_0x1"
\ No newline at end of file
+BOT_CREATOR = "Anon_0x1"
+
+# Seconds a single document may spend in the question parser
+PARSE_TIME_BUDGET = float(os.getenv('PARSE_TIME_BUDGET', '5'))
+
+# Parse result cache limits
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv('PARSE_CACHE_MAX_ENTRIES', '256'))
+PARSE_CACHE_MAX_BYTES = int(os.getenv('PARSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# PDFs with at least this many pages are extracted on a process pool
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '40'))
+
+# Worker pools that keep blocking work off the event loop
+OFFLOAD_IO_WORKERS = int(os.getenv('OFFLOAD_IO_WORKERS', '16'))
+OFFLOAD_CPU_WORKERS = int(os.getenv('OFFLOAD_CPU_WORKERS', str(os.cpu_count() or 1)))
+
+# Largest document the bot will download (the Bot API caps downloads at 20 MB)
+MAX_DOCUMENT_BYTES = int(os.getenv('MAX_DOCUMENT_BYTES', str(20 * 1024 * 1024)))
+
+# PDF text backend: pypdf2 (default), pypdfium2 or pdfminer when installed
+PDF_BACKEND = os.getenv('PDF_BACKEND', 'pypdf2')
+
+# Caps for the streaming PDF pipeline; hitting one returns partial results
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '300'))
+PDF_MAX_SECONDS = float(os.getenv('PDF_MAX_SECONDS', '60'))
+# Minimum seconds between progress message edits
+PDF_PROGRESS_INTERVAL = float(os.getenv('PDF_PROGRESS_INTERVAL', '2'))
+
+# On-disk cache of processed PDFs (repeat uploads skip download and extraction)
+PDF_CACHE_DIR = os.getenv('PDF_CACHE_DIR', os.path.join('.cache', 'pdf'))
+PDF_CACHE_MAX_BYTES = int(os.getenv('PDF_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+PDF_CACHE_MAX_AGE_DAYS = float(os.getenv('PDF_CACHE_MAX_AGE_DAYS', '30'))
+
+# Google Forms batchUpdate chunking and retries for large exams
+FORMS_BATCH_MAX_REQUESTS = int(os.getenv('FORMS_BATCH_MAX_REQUESTS', '100'))
+FORMS_BATCH_MAX_BYTES = int(os.getenv('FORMS_BATCH_MAX_BYTES', str(1024 * 1024)))
+FORMS_MAX_RETRIES = int(os.getenv('FORMS_MAX_RETRIES', '6'))
+
+# Google API requests per minute (stay under the project quota) and burst size
+FORMS_REQUESTS_PER_MINUTE = int(os.getenv('FORMS_REQUESTS_PER_MINUTE', '300'))
+DRIVE_REQUESTS_PER_MINUTE = int(os.getenv('DRIVE_REQUESTS_PER_MINUTE', '600'))
+GOOGLE_RATE_BURST = int(os.getenv('GOOGLE_RATE_BURST', '10'))
+
+# Optional pre-built quiz form copied for direct links instead of building
+# each form from scratch (it must not contain any questions)
+FORM_TEMPLATE_ID = os.getenv('FORM_TEMPLATE_ID') or None
+
+# Empty, pre-shared forms kept ready for direct links (0 disables the pool)
+FORM_POOL_SIZE = int(os.getenv('FORM_POOL_SIZE', '0'))
+FORM_POOL_MAX_AGE_HOURS = float(os.getenv('FORM_POOL_MAX_AGE_HOURS', '24'))
+FORM_POOL_FILE = os.getenv('FORM_POOL_FILE', os.path.join('.cache', 'form_pool.json'))
+
+# SQLite registry of created forms, so an identical exam reuses its form
+FORM_REGISTRY_DB = os.getenv('FORM_REGISTRY_DB', os.path.join('.cache', 'forms.sqlite3'))
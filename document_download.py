@@ -0,0 +1,45 @@
+"""
+In-memory download of Telegram documents with a size cap.
+
+Documents are downloaded into memory instead of temp files, so nothing
+touches the disk and nothing is left behind when parsing fails.
+"""
+import io
+
+class DocumentTooLargeError(ValueError):
+    """Raised when a document exceeds the configured size limit"""
+
+def _too_large_message(max_bytes):
+    return f"Document is larger than the {max_bytes / (1024 * 1024):.1f} MB limit"
+
+class LimitedBuffer(io.BytesIO):
+    """BytesIO that refuses to grow past max_bytes"""
+
+    def __init__(self, max_bytes):
+        super().__init__()
+        self.max_bytes = max_bytes
+
+    def write(self, data):
+        if self.tell() + len(data) > self.max_bytes:
+            raise DocumentTooLargeError(_too_large_message(self.max_bytes))
+        return super().write(data)
+
+def check_size(size, max_bytes):
+    if size and size > max_bytes:
+        raise DocumentTooLargeError(_too_large_message(max_bytes))
+
+async def download_document(document, max_bytes) -> bytes:
+    """Download a telegram Document into memory and return its bytes.
+
+    The size is checked against max_bytes from the message metadata, again
+    from getFile, and finally while the buffer is written, so an oversized
+    file is rejected as early as the Bot API allows.
+    """
+    check_size(document.file_size, max_bytes)
+    telegram_file = await document.get_file()
+    check_size(telegram_file.file_size, max_bytes)
+
+    buffer = LimitedBuffer(max_bytes)
+    await telegram_file.download_to_memory(out=buffer)
+    # bytes (not a memoryview) so it can be sent to worker processes
+    return buffer.getvalue()
@@ -0,0 +1,195 @@
+"""
+Background pool of empty, already shared Google Forms.
+
+forms.create (or the template copy) and the Drive sharing call happen ahead
+of time, so a direct-link request only has to write the title and the
+questions:
+
+    pool = FormPool(size=5)
+    await pool.start()                                # from Application.post_init
+    result = await create_form_from_pool(pool, questions, title, user)
+
+The pool is refilled in the background as forms are taken, forms older than
+max_age are retired (deleted), and the idle form ids are kept in a small
+JSON file so a restart reuses them instead of leaking them.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+
+from google_forms_api import FORM_DESCRIPTION
+from google_forms_async import (GoogleApiError, call_with_retry, create_google_form_async, delete_form_async,
+                                fill_form_async, get_client, rename_form_async, share_form_async)
+from offload import run_io
+
+# Title the reserved forms carry until they are filled
+RESERVED_TITLE = "Exam form (reserved)"
+
+class FormPool:
+    def __init__(self, size, max_age=24 * 3600, path=None, template_id=None, refill_interval=300, max_concurrent=2):
+        self.size = size
+        self.max_age = max_age
+        self.path = path
+        self.template_id = template_id
+        self.refill_interval = refill_interval
+        self.max_concurrent = max_concurrent
+        self._forms = []  # {"form_id", "created", "template"}, oldest first
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._tasks = set()  # background retirements, kept so they aren't garbage collected
+        self._dirty = False
+        self._save_lock = threading.Lock()
+        self.taken = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._forms)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._forms = json.load(f)
+            print(f"Form pool: loaded {len(self._forms)} idle forms")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Form pool: could not load {self.path}: {e}")
+
+    def _save(self, forms):
+        if not self.path:
+            return
+        with self._save_lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(forms, f)
+            os.replace(tmp_path, self.path)
+
+    async def _flush(self):
+        """Write the idle forms to the pool file off the event loop"""
+        self._dirty = False
+        await run_io(self._save, list(self._forms))
+
+    async def start(self):
+        if self.size <= 0 or self._task is not None:
+            return
+        self._load()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop refilling; idle forms stay in the pool file for the next start"""
+        if self._task is None:
+            # Never started (e.g. size 0), so the file was never loaded; leave it as it is
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._flush()
+
+    def take(self):
+        """An idle form ({"form_id", ...}) or None when the pool is empty"""
+        now = time.time()
+        while self._forms:
+            entry = self._forms.pop(0)
+            # A template change makes the pooled copies useless
+            if now - entry["created"] <= self.max_age and entry.get("template") == self.template_id:
+                self.taken += 1
+                # The refill loop writes the file promptly, so a restart never hands this form out again
+                self._dirty = True
+                self._wakeup.set()
+                return entry
+            self._retire_later(entry)
+        self.misses += 1
+        self._wakeup.set()
+        return None
+
+    def _retire_later(self, entry):
+        task = asyncio.create_task(self._retire(entry))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _retire(self, entry):
+        if await delete_form_async(entry["form_id"]):
+            print(f"Form pool: retired {entry['form_id']}")
+
+    async def _create_entry(self):
+        client = get_client()
+        if self.template_id:
+            copied = await call_with_retry(lambda: client.copy_file(self.template_id, RESERVED_TITLE), "drive.files.copy")
+            form_id = copied['id']
+        else:
+            created = await call_with_retry(lambda: client.create_form(RESERVED_TITLE), "forms.create")
+            form_id = created['formId']
+        if await share_form_async(form_id, client) is None:
+            # Unshared forms are no use for direct links
+            await self._retire({"form_id": form_id})
+            return None
+        return {"form_id": form_id, "created": time.time(), "template": self.template_id}
+
+    async def _refill(self):
+        now = time.time()
+        stale = [entry for entry in self._forms if now - entry["created"] > self.max_age
+                 or entry.get("template") != self.template_id]
+        if stale:
+            self._forms = [entry for entry in self._forms if entry not in stale]
+            await self._flush()
+            await asyncio.gather(*(self._retire(entry) for entry in stale))
+
+        missing = self.size - len(self._forms)
+        if not missing and not stale:
+            return
+        while missing > 0:
+            batch = min(missing, self.max_concurrent)
+            entries = await asyncio.gather(*(self._create_entry() for _ in range(batch)), return_exceptions=True)
+            created = [entry for entry in entries if isinstance(entry, dict)]
+            for entry in entries:
+                if isinstance(entry, Exception):
+                    print(f"⚠️ Form pool: could not create a form: {entry}")
+            self._forms.extend(created)
+            await self._flush()
+            if len(created) < batch:
+                # Quota or API trouble; try again on the next wake-up
+                break
+            missing -= batch
+        print(f"Form pool: {len(self._forms)}/{self.size} forms ready")
+
+    async def _run(self):
+        while True:
+            try:
+                if self._dirty:
+                    await self._flush()
+                await self._refill()
+            except (GoogleApiError, OSError) as e:
+                print(f"⚠️ Form pool refill failed: {e}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.refill_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {"ready": len(self._forms), "size": self.size, "taken": self.taken, "misses": self.misses}
+
+async def create_form_from_pool(pool, questions, form_title, user=None, template_id=None):
+    """Fill a pooled form, or create one the usual way if the pool is empty"""
+    entry = pool.take() if pool is not None else None
+    if entry is None:
+        return await create_google_form_async(questions, form_title, user=user, template_id=template_id)
+    form_id = entry["form_id"]
+    # Template copies keep the template's description
+    description = None if entry.get("template") else FORM_DESCRIPTION
+    # The Drive name is still RESERVED_TITLE; rename it alongside the fill
+    rename = asyncio.create_task(rename_form_async(form_id, form_title, user=user))
+    result = await fill_form_async(form_id, questions, form_title, user=user, description=description)
+    await rename
+    if not result["success"]:
+        # A half-filled form can't go back to the pool, and nobody gets its link
+        await pool._retire(entry)
+        return {"success": False, "error": result["error"]}
+    return result
@@ -0,0 +1,146 @@
+"""
+Registry of created forms, keyed by chat and the exam's content.
+
+A double tap on "Direct Google Form Link" or an identical exam resubmitted
+in the same chat returns the form that already exists instead of building
+(and paying quota for) a new one. Requests for the same exam that arrive
+while its form is still being created wait for that one creation instead
+of starting their own. Other chats always get their own form, so two
+teachers never share one set of responses.
+
+    result = await registry.get_or_create(chat_id, questions, title, lambda: create_form(...))
+
+It also remembers the last direct form of each chat (its item ids, see
+google_forms_async.read_form_items), so a corrected exam can update that
+form in place instead of creating another one.
+"""
+import asyncio
+import hashlib
+import json
+import time
+
+from google_forms_api import normalize_question
+from offload import run_io
+from sqlite_store import SqliteStore
+
+def form_key(chat_id, questions, title) -> str:
+    payload = json.dumps(
+        {"chat": chat_id, "title": ' '.join(title.split()), "questions": [normalize_question(q) for q in questions]},
+        ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class FormRegistry(SqliteStore):
+    def __init__(self, path):
+        super().__init__(path)
+        self._in_flight = {}
+        with self._lock, self._db:
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(forms)")]
+            if columns and 'chat_id' not in columns:
+                # Keys from before forms were per chat could hand one chat's form to another
+                self._db.execute("DROP TABLE forms")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS forms ("
+                " key TEXT PRIMARY KEY, chat_id INTEGER NOT NULL, form_id TEXT NOT NULL, edit_url TEXT,"
+                " response_url TEXT, title TEXT, question_count INTEGER, created REAL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS chat_forms ("
+                " chat_id INTEGER PRIMARY KEY, form_id TEXT NOT NULL, form TEXT NOT NULL, updated REAL)"
+            )
+        self.hits = 0
+        self.coalesced = 0
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT form_id, edit_url, response_url FROM forms WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"form_id": row[0], "edit_url": row[1], "response_url": row[2], "success": True}
+
+    def _insert(self, key, chat_id, result, title, question_count):
+        self._db.execute(
+            "INSERT OR REPLACE INTO forms VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, chat_id, result["form_id"], result["edit_url"], result["response_url"], title, question_count,
+             time.time())
+        )
+
+    def put(self, key, chat_id, result, title, question_count):
+        with self._lock, self._db:
+            self._insert(key, chat_id, result, title, question_count)
+
+    def forget(self, form_id):
+        """Drop a form (e.g. deleted in Drive) so the next request recreates it"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM forms WHERE form_id = ?", (form_id,))
+            self._db.execute("DELETE FROM chat_forms WHERE form_id = ?", (form_id,))
+
+    def replace(self, chat_id, questions, title, result):
+        """Re-key a form whose questions were updated in place"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM forms WHERE form_id = ?", (result["form_id"],))
+            self._insert(form_key(chat_id, questions, title), chat_id, result, title, len(questions))
+
+    def chat_form(self, chat_id):
+        """The chat's last direct form (a read_form_items dict), or None"""
+        with self._lock:
+            row = self._db.execute("SELECT form FROM chat_forms WHERE chat_id = ?", (chat_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def remember_chat_form(self, chat_id, form):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO chat_forms VALUES (?, ?, ?, ?)",
+                (chat_id, form["form_id"], json.dumps(form, ensure_ascii=False), time.time())
+            )
+
+    async def get_or_create(self, chat_id, questions, title, create, exists=None):
+        """The form this chat already has for this exam, or the result of
+        await create().
+
+        Only successful creations are registered. A repeat returns the stored
+        result with "reused": True; concurrent requests for the same exam
+        share one create() call. With exists, a stored form for which
+        await exists(form_id) is false is forgotten and created again.
+        """
+        key = form_key(chat_id, questions, title)
+        if key not in self._in_flight:
+            existing = await run_io(self.get, key)
+            if existing is not None and exists is not None and not await exists(existing["form_id"]):
+                print(f"Form registry: {existing['form_id']} no longer exists, creating a new form")
+                await run_io(self.forget, existing["form_id"])
+                existing = None
+            if existing is not None:
+                self.hits += 1
+                print(f"Form registry hit: {existing['form_id']}")
+                return {**existing, "reused": True}
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            print("Form registry: joining an in-flight creation of the same exam")
+            result = await asyncio.shield(in_flight)
+            return {**result, "reused": result["success"]}
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await create()
+            if result["success"]:
+                await run_io(self.put, key, chat_id, result, title, len(questions))
+            future.set_result(result)
+            return result
+        except BaseException as error:
+            future.set_exception(error)
+            # Nobody may be waiting; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM forms").fetchone()[0]
+        return {"forms": count, "hits": self.hits, "coalesced": self.coalesced}
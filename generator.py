@@ -1,4 +1,7 @@
-from parser import QuestionType
+from parser import Question, QuestionType
+
+def _escape(text):
+    return text.replace('"', '\\"')
 
 def generate_google_form_script(questions):
     if not questions:
@@ -6,38 +9,36 @@ def generate_google_form_script(questions):
 
     # Validate questions format
     for q_idx, q_item in enumerate(questions):
-        if not isinstance(q_item, dict) or 'type' not in q_item or 'text' not in q_item: # Changed 'question' to 'text'
+        if not isinstance(q_item, Question):
             raise ValueError(f"Invalid question format for question at index {q_idx}")
     script = '''function createForm() {\n'''
     script += '  var form = FormApp.create("Exam Questions");\n\n'
 
     for idx, q in enumerate(questions, start=1):
-        question_title = q['text'].replace('"', '\\"') # Escape quotes in question title
+        question_title = _escape(q.text) # Escape quotes in question title
 
-        script += f"\n  // Question {idx}: {q['type'].name}\n"
+        script += f"\n  // Question {idx}: {q.type.name}\n"
 
-        if q["type"] == QuestionType.TRUE_FALSE:
+        if q.type == QuestionType.TRUE_FALSE:
             script += f'''  var item{idx} = form.addMultipleChoiceItem();
   item{idx}.setTitle("{question_title}")
       .setChoices([
           item{idx}.createChoice("True"),
           item{idx}.createChoice("False")
       ])
-      .setCorrectAnswers([item{idx}.createAnswer("{q['correct_text']}")]); // Assumes correct_text is "TRUE" or "FALSE"
+      .setCorrectAnswers([item{idx}.createAnswer("{q.correct_text}")]); // Assumes correct_text is "TRUE" or "FALSE"
   \n'''
 
-        elif q["type"] == QuestionType.SHORT_ANSWER:
+        elif q.type == QuestionType.SHORT_ANSWER:
             script += f'''  var item{idx} = form.addTextItem();
   item{idx}.setTitle("{question_title}");
   \n''' # No explicit correct answer setting in form script for short answer
 
-        elif q["type"] == QuestionType.CHECKBOX:
-            # Choices are expected to be like "A. Choice Text", strip prefix for display
-            choices_code = ',\n          '.join([f'item{idx}.createChoice("{choice_str[choice_str.find(".") + 1:].strip().replace("\"", "\\\"")}")' for choice_str in q.get("choices", [])])
+        elif q.type == QuestionType.CHECKBOX:
+            choices_code = ',\n          '.join([f'item{idx}.createChoice("{_escape(choice.text)}")' for choice in q.choices])
             
-            # Use pre-derived correct_text_list from parser
-            correct_answers_texts = q.get("correct_text_list", [])
-            correct_answers_code = ',\n          '.join([f'item{idx}.createAnswer("{ans_text.replace("\"", "\\\"")}")' for ans_text in correct_answers_texts])
+            correct_answers_texts = [q.correct_text] if q.correct_choice else []
+            correct_answers_code = ',\n          '.join([f'item{idx}.createAnswer("{_escape(ans_text)}")' for ans_text in correct_answers_texts])
 
             script += f'''  var item{idx} = form.addCheckboxItem();
   item{idx}.setTitle("{question_title}")
@@ -49,11 +50,11 @@ def generate_google_form_script(questions):
       ]);
   \n'''
 
-        elif q["type"] == QuestionType.DROPDOWN:
-            choices_code = ',\n          '.join([f'item{idx}.createChoice("{choice_str[choice_str.find(".") + 1:].strip().replace("\"", "\\\"")}")' for choice_str in q.get("choices", [])])
+        elif q.type == QuestionType.DROPDOWN:
+            choices_code = ',\n          '.join([f'item{idx}.createChoice("{_escape(choice.text)}")' for choice in q.choices])
             # Dropdowns typically don't have a single "correct" answer marked in Google Forms UI in the same way MCQs do.
             # If a correct answer needs to be stored, it might be for grading outside the form.
-            # The parser now stores q['correct_text'] for dropdown if a correct answer was specified.
+            # The parser stores q.correct_text for dropdown if a correct answer was specified.
             # However, addListItem().setCorrectAnswers() doesn't exist.
             # If grading/feedback is desired, it would be via item.setFeedbackForCorrect(FormApp.createFeedback().setText("...").build());
             # For now, just creating the dropdown.
@@ -65,19 +66,19 @@ def generate_google_form_script(questions):
   \n'''
 
         else:  # MULTIPLE_CHOICE
-            choices_code = ',\n          '.join([f'item{idx}.createChoice("{choice_str[choice_str.find(".") + 1:].strip().replace("\"", "\\\"")}")' for choice_str in q.get("choices", [])])
+            choices_code = ',\n          '.join([f'item{idx}.createChoice("{_escape(choice.text)}")' for choice in q.choices])
             
             # Parser now aims to always provide correct_text if a valid correct answer was parsed
-            correct_answer_text = q.get("correct_text", "") 
-            if not correct_answer_text and q.get("choices"): # Fallback if parser somehow missed it (shouldn't happen)
-                correct_answer_text = q["choices"][0][q["choices"][0].find(".") + 1:].strip()
+            correct_answer_text = q.correct_text
+            if not correct_answer_text and q.choices: # Fallback if parser somehow missed it (shouldn't happen)
+                correct_answer_text = q.choices[0].text
             
             script += f'''  var item{idx} = form.addMultipleChoiceItem();
   item{idx}.setTitle("{question_title}")
       .setChoices([
           {choices_code}
       ])
-      .setCorrectAnswers([item{idx}.createAnswer("{correct_answer_text.replace("\"", "\\\"")}")]);
+      .setCorrectAnswers([item{idx}.createAnswer("{_escape(correct_answer_text)}")]);
   \n'''
 
     script += '  Logger.log("Form created: " + form.getEditUrl());\n}'
@@ -0,0 +1,118 @@
+"""
+Process-wide Google API clients.
+
+Service-account credentials are loaded once and refreshed ahead of expiry.
+Forms and Drive services are built from the discovery documents bundled
+with google-api-python-client and kept per thread (httplib2 transports are
+not thread-safe), so after warm-up a form costs no client setup at all.
+
+    service = forms_service()      # reused by every call on this thread
+    drive = drive_service()
+"""
+import datetime
+import json
+import os
+import threading
+
+import google_auth_httplib2
+import httplib2
+from google.oauth2.service_account import Credentials
+from googleapiclient.discovery import build
+
+# Google Forms API scopes - Added Drive scope for sharing
+SCOPES = [
+    'https://www.googleapis.com/auth/forms.body',
+    'https://www.googleapis.com/auth/forms.responses.readonly',
+    'https://www.googleapis.com/auth/drive'
+]
+
+# Key files tried in order before the GOOGLE_SERVICE_ACCOUNT_JSON env var
+CREDENTIAL_FILES = (
+    'service_account.json',
+    'exambot-155879-f9462666942b-424FWb4IpPapkTPtywk8rzWghfqH73.json',
+)
+
+# Refresh the access token this many seconds before it expires, so no API
+# call ever waits on (or races) a refresh of an expired token.
+REFRESH_MARGIN = 300
+
+HTTP_TIMEOUT = 60
+
+# Held while credentials are loaded or refreshed (network I/O). Readers never
+# take it: swapping _credentials is atomic, so a thread wanting a fresh token
+# waits here, while cached_token() just reads the current one.
+_refresh_lock = threading.Lock()
+_credentials = None
+_refresh_request = None
+_local = threading.local()
+
+def load_credentials():
+    """Read the service-account credentials from disk or the environment"""
+    for path in CREDENTIAL_FILES:
+        if os.path.exists(path):
+            return Credentials.from_service_account_file(path, scopes=SCOPES)
+    creds_json = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON')
+    if creds_json:
+        return Credentials.from_service_account_info(json.loads(creds_json), scopes=SCOPES)
+    raise ValueError("No Google service account credentials found")
+
+def set_credentials(credentials):
+    """Use these credentials instead of loading them (benchmarks, other accounts)"""
+    global _credentials
+    with _refresh_lock:
+        _credentials = credentials
+
+def _needs_refresh(credentials) -> bool:
+    if not credentials.token or credentials.expiry is None:
+        return True
+    # google-auth keeps expiry as a naive UTC datetime
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    return credentials.expiry - now < datetime.timedelta(seconds=REFRESH_MARGIN)
+
+def get_credentials():
+    """Shared credentials with a token valid for at least REFRESH_MARGIN seconds.
+    May block on the network; keep it off the event loop."""
+    global _credentials, _refresh_request
+    credentials = _credentials
+    if credentials is not None and not _needs_refresh(credentials):
+        return credentials
+    with _refresh_lock:
+        # Another thread may have refreshed while this one waited
+        if _credentials is None:
+            _credentials = load_credentials()
+        if _needs_refresh(_credentials):
+            if _refresh_request is None:
+                _refresh_request = google_auth_httplib2.Request(httplib2.Http(timeout=HTTP_TIMEOUT))
+            _credentials.refresh(_refresh_request)
+            print(f"Google token refreshed, valid until {_credentials.expiry} UTC")
+        return _credentials
+
+def access_token() -> str:
+    return get_credentials().token
+
+def cached_token():
+    """The current token if it needs no refresh, else None. Takes no lock and
+    never touches the network, so event-loop code can call it before falling
+    back to access_token() in a thread."""
+    credentials = _credentials
+    if credentials is None or _needs_refresh(credentials):
+        return None
+    return credentials.token
+
+def _service(name, version):
+    credentials = get_credentials()
+    services = _local.__dict__.setdefault('services', {})
+    built_with, service = services.get((name, version), (None, None))
+    if built_with is not credentials:
+        # One keep-alive connection per thread, authorised with the shared
+        # credentials
+        http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+        service = build(name, version, http=http, static_discovery=True, cache_discovery=False)
+        services[(name, version)] = (credentials, service)
+    return service
+
+def forms_service():
+    return _service('forms', 'v1')
+
+def drive_service():
+    return _service('drive', 'v3')
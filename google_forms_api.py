@@ -1,251 +1,518 @@
+import asyncio
+import difflib
+import email.utils
 import json
-import os
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+
+import httplib2
 from googleapiclient.errors import HttpError
 from parser import QuestionType
+from google_clients import forms_service
 
-# Google Forms API scopes - Added Drive scope for sharing
-SCOPES = [
-    'https://www.googleapis.com/auth/forms.body',
-    'https://www.googleapis.com/auth/forms.responses.readonly',
-    'https://www.googleapis.com/auth/drive'
-]
+# Description set on every generated form
+FORM_DESCRIPTION = "Auto-generated exam form created by Exam Bot"
 
-def create_google_form(questions, form_title="Exam Questions", user_email=None):
-    """Create a Google Form using the Google Forms API"""
-    try:
-        # Load service account credentials
-        if os.path.exists('service_account.json'):
-            credentials = Credentials.from_service_account_file(
-                'service_account.json', scopes=SCOPES)
-        elif os.path.exists('exambot-155879-f9462666942b-424FWb4IpPapkTPtywk8rzWghfqH73.json'):
-            credentials = Credentials.from_service_account_file(
-                'exambot-155879-f9462666942b-424FWb4IpPapkTPtywk8rzWghfqH73.json', scopes=SCOPES)
-        else:
-            # Fallback to environment variable
-            creds_json = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON')
-            if creds_json:
-                credentials = Credentials.from_service_account_info(
-                    json.loads(creds_json), scopes=SCOPES)
-            else:
-                raise ValueError("No Google service account credentials found")
-
-        # Build the Forms API service
-        service = build('forms', 'v1', credentials=credentials)
-        # Build Drive API service for sharing
-        drive_service = build('drive', 'v3', credentials=credentials)
-
-        # Step 1: Create the form with ONLY title
-        form_body = {
-            "info": {
-                "title": form_title
+def build_question_item(question, index):
+    """createItem request for one question at position index"""
+    # Create the base question item
+    question_item = {
+        "createItem": {
+            "item": {
+                "title": question.text,
+                "questionItem": {
+                    "question": {
+                        "required": True
+                    }
+                }
+            },
+            "location": {
+                "index": index
             }
         }
+    }
 
-        print(f"Creating form with title: {form_title}")
+    # Configure question type
+    if question.type == QuestionType.MULTIPLE_CHOICE:
+        choices = [{"value": choice.text} for choice in question.choices]
+        
+        question_item["createItem"]["item"]["questionItem"]["question"]["choiceQuestion"] = {
+            "type": "RADIO",
+            "options": choices
+        }
 
-        # Create the form
-        result = service.forms().create(body=form_body).execute()
-        form_id = result['formId']
-        form_url = f"https://docs.google.com/forms/d/{form_id}/edit"
-        response_url = f"https://docs.google.com/forms/d/{form_id}/viewform"
+    elif question.type == QuestionType.TRUE_FALSE:
+        question_item["createItem"]["item"]["questionItem"]["question"]["choiceQuestion"] = {
+            "type": "RADIO",
+            "options": [
+                {"value": "True"},
+                {"value": "False"}
+            ]
+        }
 
-        print(f"Form created successfully with ID: {form_id}")
+    elif question.type == QuestionType.CHECKBOX:
+        choices = [{"value": choice.text} for choice in question.choices]
+        
+        question_item["createItem"]["item"]["questionItem"]["question"]["choiceQuestion"] = {
+            "type": "CHECKBOX",
+            "options": choices
+        }
 
-        # Step 2: Share the form with anyone (make it publicly editable by the creator)
-        try:
-            # Make the form publicly viewable and allow anyone with link to edit
-            permission_body = {
-                'type': 'anyone',
-                'role': 'writer'  # This allows editing
-            }
-            
-            drive_service.permissions().create(
-                fileId=form_id,
-                body=permission_body
-            ).execute()
-            
-            print("Form shared successfully - anyone with link can edit")
-            
-        except Exception as e:
-            print(f"Warning: Could not share form publicly: {e}")
-            # Try alternative sharing method
-            try:
-                permission_body = {
-                    'type': 'anyone',
-                    'role': 'reader'  # At least make it viewable
-                }
-                
-                drive_service.permissions().create(
-                    fileId=form_id,
-                    body=permission_body
-                ).execute()
-                
-                print("Form made publicly viewable")
-                
-            except Exception as e2:
-                print(f"Warning: Could not share form at all: {e2}")
-
-        # Step 3: Add description using batchUpdate
-        description_request = {
-            "requests": [{
-                "updateFormInfo": {
-                    "info": {
-                        "description": "Auto-generated exam form created by Exam Bot"
-                    },
-                    "updateMask": "description"
-                }
-            }]
+    elif question.type == QuestionType.DROPDOWN:
+        choices = [{"value": choice.text} for choice in question.choices]
+        
+        question_item["createItem"]["item"]["questionItem"]["question"]["choiceQuestion"] = {
+            "type": "DROP_DOWN",
+            "options": choices
         }
 
-        try:
-            service.forms().batchUpdate(
-                formId=form_id, 
-                body=description_request
-            ).execute()
-            print("Description added successfully")
-        except Exception as e:
-            print(f"Warning: Could not add description: {e}")
-
-        # Step 4: Add questions using batchUpdate
-        if questions:
-            requests = []
-            
-            for idx, question in enumerate(questions):
-                print(f"Processing question {idx + 1}: {question['text'][:50]}...")
-                
-                # Create the base question item
-                question_item = {
-                    "createItem": {
-                        "item": {
-                            "title": question['text'],
-                            "questionItem": {
-                                "question": {
-                                    "required": True
-                                }
-                            }
-                        },
-                        "location": {
-                            "index": idx
-                        }
-                    }
-                }
+    elif question.type == QuestionType.SHORT_ANSWER:
+        question_item["createItem"]["item"]["questionItem"]["question"]["textQuestion"] = {
+            "paragraph": False
+        }
 
-                # Configure question type
-                if question["type"] == QuestionType.MULTIPLE_CHOICE:
-                    choices = []
-                    for choice in question.get("choices", []):
-                        if choice.startswith(('A.', 'B.', 'C.', 'D.')):
-                            choice_text = choice[2:].strip()
-                        else:
-                            choice_text = choice.strip()
-                        choices.append({"value": choice_text})
-                    
-                    question_item["createItem"]["item"]["questionItem"]["question"]["choiceQuestion"] = {
-                        "type": "RADIO",
-                        "options": choices
-                    }
+    return question_item
 
-                elif question["type"] == QuestionType.TRUE_FALSE:
-                    question_item["createItem"]["item"]["questionItem"]["question"]["choiceQuestion"] = {
-                        "type": "RADIO",
-                        "options": [
-                            {"value": "True"},
-                            {"value": "False"}
-                        ]
-                    }
+def normalize_question(question) -> dict:
+    """The parts of a question that end up on the form, whitespace-normalised"""
+    return {
+        "text": ' '.join(question.text.split()),
+        "type": question.type.value,
+        "choices": [' '.join(choice.text.split()) for choice in question.choices],
+    }
 
-                elif question["type"] == QuestionType.CHECKBOX:
-                    choices = []
-                    for choice in question.get("choices", []):
-                        if choice.startswith(('A.', 'B.', 'C.', 'D.')):
-                            choice_text = choice[2:].strip()
-                        else:
-                            choice_text = choice.strip()
-                        choices.append({"value": choice_text})
-                    
-                    question_item["createItem"]["item"]["questionItem"]["question"]["choiceQuestion"] = {
-                        "type": "CHECKBOX",
-                        "options": choices
-                    }
+def _question_kind(question_type) -> str:
+    return "textQuestion" if question_type == QuestionType.SHORT_ANSWER.value else "choiceQuestion"
 
-                elif question["type"] == QuestionType.DROPDOWN:
-                    choices = []
-                    for choice in question.get("choices", []):
-                        if choice.startswith(('A.', 'B.', 'C.', 'D.')):
-                            choice_text = choice[2:].strip()
-                        else:
-                            choice_text = choice.strip()
-                        choices.append({"value": choice_text})
-                    
-                    question_item["createItem"]["item"]["questionItem"]["question"]["choiceQuestion"] = {
-                        "type": "DROP_DOWN",
-                        "options": choices
-                    }
+def update_item_request(question, index):
+    """updateItem rewriting the question at index in place (its item and
+    question ids, and so its responses, are kept)"""
+    item = build_question_item(question, index)["createItem"]["item"]
+    return {
+        "updateItem": {
+            "item": item,
+            "location": {"index": index},
+            "updateMask": f"title,questionItem.question.{_question_kind(question.type.value)}"
+        }
+    }
 
-                elif question["type"] == QuestionType.SHORT_ANSWER:
-                    question_item["createItem"]["item"]["questionItem"]["question"]["textQuestion"] = {
-                        "paragraph": False
-                    }
+def diff_form_items(old, questions):
+    """Requests turning a form showing old (normalize_question dicts, in item
+    order) into questions, touching only what changed.
+
+    Unchanged questions keep their items, moved ones get a moveItem, edited
+    ones an updateItem; the rest is deleteItem/createItem. Returns
+    (requests, sources) where sources[j] is the old index whose item
+    question j ends up in, or None for a created item.
+    """
+    new = [normalize_question(question) for question in questions]
+    old_keys = [json.dumps(question, sort_keys=True) for question in old]
+    new_keys = [json.dumps(question, sort_keys=True) for question in new]
+    sources = [None] * len(new)
+    edited = set()
+
+    changes = []
+    matcher = difflib.SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for offset in range(i2 - i1):
+                sources[j1 + offset] = i1 + offset
+        else:
+            changes.append((range(i1, i2), range(j1, j2)))
+
+    # A question that only moved keeps its item
+    removed = {}
+    for olds, _ in changes:
+        for i in olds:
+            removed.setdefault(old_keys[i], []).append(i)
+    kept = {i for i in sources if i is not None}
+    for _, news in changes:
+        for j in news:
+            if removed.get(new_keys[j]):
+                sources[j] = removed[new_keys[j]].pop(0)
+                kept.add(sources[j])
+    # An edited question takes over the item it replaced, if the kind matches
+    for olds, news in changes:
+        olds = [i for i in olds if i not in kept]
+        news = [j for j in news if sources[j] is None]
+        for i, j in zip(olds, news):
+            if _question_kind(old[i]["type"]) == _question_kind(new[j]["type"]):
+                sources[j] = i
+                kept.add(i)
+                edited.add(j)
+
+    requests = []
+    # Items in form order, as old indices (None for created ones)
+    current = list(range(len(old)))
+    for i in reversed(range(len(old))):
+        if i not in kept:
+            requests.append({"deleteItem": {"location": {"index": i}}})
+            del current[i]
+    # Everything before position p is final, so the item for p is at p or later
+    for p, source in enumerate(sources):
+        if source is None:
+            requests.append(build_question_item(questions[p], p))
+            current.insert(p, None)
+            continue
+        at = current.index(source, p)
+        if at != p:
+            requests.append({"moveItem": {"originalLocation": {"index": at}, "newLocation": {"index": p}}})
+            current.insert(p, current.pop(at))
+        if p in edited:
+            requests.append(update_item_request(questions[p], p))
+    return requests, sources
+
+def form_urls(form_id):
+    return {
+        "form_id": form_id,
+        "edit_url": f"https://docs.google.com/forms/d/{form_id}/edit",
+        "response_url": f"https://docs.google.com/forms/d/{form_id}/viewform",
+    }
 
-                requests.append(question_item)
-
-            # Execute batch update to add all questions
-            if requests:
-                batch_update_body = {"requests": requests}
-                print(f"Adding {len(requests)} questions to form...")
-                
-                service.forms().batchUpdate(
-                    formId=form_id, 
-                    body=batch_update_body
-                ).execute()
-                
-                print("Questions added successfully!")
-
-        return {
-            "form_id": form_id,
-            "edit_url": form_url,
-            "response_url": response_url,
-            "success": True
+def title_request(title):
+    return {
+        "updateFormInfo": {
+            "info": {
+                "title": title
+            },
+            "updateMask": "title"
         }
+    }
 
-    except HttpError as error:
-        print(f"Google Forms API error: {error}")
-        return {
-            "success": False,
-            "error": f"Google Forms API error: {str(error)}"
+def form_info_request(title, description=None):
+    """Title and optionally the description in one updateFormInfo"""
+    info = {"title": title}
+    if description:
+        info["description"] = description
+    return {
+        "updateFormInfo": {
+            "info": info,
+            "updateMask": ",".join(info)
         }
-    except Exception as error:
-        print(f"Unexpected error: {error}")
-        return {
-            "success": False,
-            "error": f"Unexpected error: {str(error)}"
+    }
+
+def description_request():
+    return {
+        "updateFormInfo": {
+            "info": {
+                "description": FORM_DESCRIPTION
+            },
+            "updateMask": "description"
         }
+    }
+
+# ---------------------------------------------------------------------------
+# Rate limiting. Every Forms/Drive call takes a token from its API's bucket
+# first, so a class of teachers creating forms at once is paced just under
+# the per-minute quota instead of bursting into 429s. Waiting callers are
+# served round-robin per user, so one 1,000-question exam cannot starve
+# everyone else.
+# ---------------------------------------------------------------------------
+
+# Requests per minute per API (keep a little under the project quota) and
+# how many may go out back to back after an idle period
+RATE_LIMITS = {'forms': 300, 'drive': 600}
+RATE_BURST = 10
+
+class TokenBucket:
+    def __init__(self, per_minute, burst):
+        self.rate = per_minute / 60.0
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, now) -> bool:
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def time_until_token(self, now) -> float:
+        self._refill(now)
+        return max((1 - self.tokens) / self.rate, 0.0)
+
+class _Waiter:
+    __slots__ = ('user', 'enqueued', 'granted', 'event', 'future', 'loop')
+
+    def __init__(self, user, event=None, future=None, loop=None):
+        self.user = user
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.event = event
+        self.future = future
+        self.loop = loop
+
+    def grant(self):
+        self.granted = True
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+class RateLimiter:
+    """Per-API token buckets with a fair (round-robin per user) wait queue.
+
+    Threads call acquire(), coroutines await acquire_async(); both share the
+    same buckets and queue. metrics() reports queue depth and wait times.
+    """
+
+    # Upper bound on how long a waiter sleeps before re-checking the bucket
+    MAX_POLL = 1.0
+
+    def __init__(self, limits=None, burst=RATE_BURST):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._queues = {}
+        self._stats = {}
+        self.configure(limits or RATE_LIMITS, burst)
+
+    def configure(self, limits, burst=RATE_BURST):
+        with self._lock:
+            for api, per_minute in limits.items():
+                self._buckets[api] = TokenBucket(per_minute, burst)
+                self._queues.setdefault(api, OrderedDict())
+                self._stats.setdefault(api, {"granted": 0, "waited": 0, "total_wait": 0.0, "max_wait": 0.0})
+
+    def _enqueue(self, api, waiter):
+        queue = self._queues[api]
+        queue.setdefault(waiter.user, deque()).append(waiter)
+
+    def _remove(self, api, waiter):
+        queue = self._queues[api]
+        waiters = queue.get(waiter.user)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del queue[waiter.user]
+
+    def _dispatch(self, api) -> float:
+        """Hand out available tokens round-robin; returns seconds until the
+        next token if anyone is still waiting. Caller holds the lock."""
+        bucket, queue = self._buckets[api], self._queues[api]
+        now = time.monotonic()
+        while queue and bucket.try_take(now):
+            user, waiters = next(iter(queue.items()))
+            waiter = waiters.popleft()
+            # The user goes to the back of the line behind everyone else
+            del queue[user]
+            if waiters:
+                queue[user] = waiters
+            self._record(api, now - waiter.enqueued)
+            waiter.grant()
+        if not queue:
+            return 0.0
+        return min(max(bucket.time_until_token(now), 0.001), self.MAX_POLL)
+
+    def _record(self, api, wait):
+        stats = self._stats[api]
+        stats["granted"] += 1
+        if wait > 0.001:
+            stats["waited"] += 1
+        stats["total_wait"] += wait
+        stats["max_wait"] = max(stats["max_wait"], wait)
+
+    def acquire(self, api, user=None):
+        """Block the calling thread until a request to api may go out"""
+        if api not in self._buckets:
+            return
+        waiter = _Waiter(user, event=threading.Event())
+        with self._lock:
+            self._enqueue(api, waiter)
+            delay = self._dispatch(api)
+        while not waiter.event.wait(delay):
+            with self._lock:
+                delay = self._dispatch(api)
+
+    async def acquire_async(self, api, user=None):
+        """Wait without blocking the event loop until a request to api may go out"""
+        if api not in self._buckets:
+            return
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(user, future=loop.create_future(), loop=loop)
+        with self._lock:
+            self._enqueue(api, waiter)
+            delay = self._dispatch(api)
+        try:
+            while not waiter.granted:
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), delay)
+                except asyncio.TimeoutError:
+                    with self._lock:
+                        delay = self._dispatch(api)
+        finally:
+            if not waiter.granted:
+                # Cancelled while queued: give up the place in line
+                with self._lock:
+                    self._remove(api, waiter)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            result = {}
+            for api, stats in self._stats.items():
+                queue = self._queues[api]
+                granted = stats["granted"]
+                result[api] = {
+                    "queue_depth": sum(len(waiters) for waiters in queue.values()),
+                    "waiting_users": len(queue),
+                    "granted": granted,
+                    "waited": stats["waited"],
+                    "avg_wait": stats["total_wait"] / granted if granted else 0.0,
+                    "max_wait": stats["max_wait"],
+                }
+            return result
+
+rate_limiter = RateLimiter()
+
+def execute(request, api='forms', user=None):
+    """request.execute() once the rate limiter lets it through"""
+    rate_limiter.acquire(api, user)
+    return request.execute()
+
+# Big exams are added in chunks: no batchUpdate grows past these limits, and
+# a failure costs one chunk instead of the whole form.
+MAX_BATCH_REQUESTS = 100
+MAX_BATCH_BYTES = 1024 * 1024
+
+# Retries per call for quota (429) and server errors, with exponential
+# backoff and full jitter between BACKOFF_BASE and BACKOFF_CAP seconds
+MAX_RETRIES = 6
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 64.0
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def configure(max_batch_requests=None, max_batch_bytes=None, max_retries=None, rate_limits=None, rate_burst=None):
+    """Override the batching/retry/rate limits; call once at start-up"""
+    global MAX_BATCH_REQUESTS, MAX_BATCH_BYTES, MAX_RETRIES
+    if max_batch_requests:
+        MAX_BATCH_REQUESTS = max_batch_requests
+    if max_batch_bytes:
+        MAX_BATCH_BYTES = max_batch_bytes
+    if max_retries is not None:
+        MAX_RETRIES = max_retries
+    if rate_limits:
+        rate_limiter.configure(rate_limits, rate_burst or RATE_BURST)
+
+class FormItemsError(Exception):
+    """Adding questions gave up; the first `committed` questions are on the form"""
+
+    def __init__(self, committed, cause):
+        super().__init__(f"{cause} (after {committed} questions were added)")
+        self.committed = committed
+        self.cause = cause
+
+def next_item_chunk(questions, start, prefix=()):
+    """Requests for questions[start:stop] within the batch limits, after any
+    prefix requests. Returns (requests, stop); always takes one question."""
+    requests = list(prefix)
+    size = sum(len(json.dumps(request)) for request in requests)
+    stop = start
+    while stop < len(questions) and len(requests) < MAX_BATCH_REQUESTS:
+        request = build_question_item(questions[stop], stop)
+        request_size = len(json.dumps(request))
+        if size + request_size > MAX_BATCH_BYTES and stop > start:
+            break
+        requests.append(request)
+        size += request_size
+        stop += 1
+    return requests, stop
+
+def retry_delay(attempt, retry_after=None) -> float:
+    """Seconds to wait before retry number attempt + 1. A Retry-After header
+    (seconds or HTTP date) wins; otherwise exponential backoff, full jitter."""
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                when = email.utils.parsedate_to_datetime(retry_after)
+                return max(when.timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+def _failure(error):
+    """(retryable, status, retry_after) for an exception from a googleapiclient call"""
+    if isinstance(error, HttpError):
+        status = error.resp.status
+        return status in RETRYABLE_STATUSES, status, error.resp.get('retry-after')
+    # Dropped connections and timeouts are worth another try
+    return isinstance(error, (OSError, httplib2.HttpLib2Error)), None, None
+
+def call_with_retry(make_request, what="Google API call", api='forms', user=None):
+    """Execute make_request() (a fresh googleapiclient request per try) through
+    the rate limiter, retrying on quota and server errors"""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return execute(make_request(), api, user)
+        except Exception as error:
+            retryable, status, retry_after = _failure(error)
+            if not retryable or attempt == MAX_RETRIES:
+                raise
+            delay = retry_delay(attempt, retry_after)
+            print(f"⚠️ {what} failed ({status or type(error).__name__}), retry {attempt + 1} in {delay:.1f}s")
+            time.sleep(delay)
+
+# Link sharing tried in order: editable, else at least viewable
+SHARE_ROLES = ('writer', 'reader')
+
+def format_timings(timings):
+    steps = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in timings.items())
+    return f"⏱️ Form timings: {steps}"
+
+def create_google_form(questions, form_title="Exam Questions", user_email=None, user=None, template_id=None):
+    """Blocking create_google_form_async for scripts without an event loop;
+    same arguments and result dict. Not for use on a running loop."""
+    # Imported here: google_forms_async builds on this module
+    from google_forms_async import close_client, create_google_form_async
+
+    async def create():
+        try:
+            return await create_google_form_async(questions, form_title, user_email, user, template_id)
+        finally:
+            # The client's HTTP session belongs to this short-lived loop
+            await close_client()
+
+    return asyncio.run(create())
+
+# Responses per responses.list page (the API maximum)
+RESPONSES_PAGE_SIZE = 5000
+
+def responses_filter(since):
+    """responses.list filter for responses submitted after since (RFC 3339)"""
+    return f"timestamp > {since}" if since else None
+
+def iter_form_responses(form_id, since=None, service=None, user=None):
+    """Yield a form's responses page by page, following nextPageToken.
+    With since (an RFC 3339 lastSubmittedTime), only newer ones."""
+    service = service or forms_service()
+    page_token = None
+    while True:
+        kwargs = {"formId": form_id, "pageSize": RESPONSES_PAGE_SIZE}
+        if page_token:
+            kwargs["pageToken"] = page_token
+        if since:
+            kwargs["filter"] = responses_filter(since)
+        page = call_with_retry(lambda: service.forms().responses().list(**kwargs), "forms.responses.list", user=user)
+        yield from page.get('responses', [])
+        page_token = page.get('nextPageToken')
+        if not page_token:
+            return
 
 def get_form_responses(form_id):
     """Get responses from a Google Form"""
     try:
-        if os.path.exists('service_account.json'):
-            credentials = Credentials.from_service_account_file(
-                'service_account.json', scopes=SCOPES)
-        elif os.path.exists('exambot-155879-f9462666942b-424FWb4IpPapkTPtywk8rzWghfqH73.json'):
-            credentials = Credentials.from_service_account_file(
-                'exambot-155879-f9462666942b-424FWb4IpPapkTPtywk8rzWghfqH73.json', scopes=SCOPES)
-        else:
-            creds_json = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON')
-            if creds_json:
-                credentials = Credentials.from_service_account_info(
-                    json.loads(creds_json), scopes=SCOPES)
-            else:
-                raise ValueError("No Google service account credentials found")
-
-        service = build('forms', 'v1', credentials=credentials)
-        
-        # Get form responses
-        result = service.forms().responses().list(formId=form_id).execute()
-        return result.get('responses', [])
-        
+        return list(iter_form_responses(form_id))
     except Exception as error:
         print(f"Error getting form responses: {error}")
         return []
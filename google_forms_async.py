@@ -0,0 +1,424 @@
+"""
+Native asyncio client for the Forms and Drive endpoints the bot uses.
+
+All calls share one aiohttp session with a keep-alive connection pool, so
+many forms can be created concurrently from the event loop without tying up
+a thread per request.
+
+    result = await create_google_form_async(questions, "Exam Questions")
+
+Credentials come from google_clients; a token refresh (blocking HTTP) is
+the only thing sent to a thread, and only when the token is about to expire.
+"""
+import asyncio
+import json
+import time
+
+import aiohttp
+
+import google_clients
+import google_forms_api
+from google_forms_api import (SHARE_ROLES, RETRYABLE_STATUSES, FormItemsError, FORM_DESCRIPTION,
+                              description_request, title_request, form_info_request, normalize_question,
+                              responses_filter, diff_form_items, next_item_chunk, retry_delay, form_urls, format_timings, rate_limiter)
+from offload import run_io
+
+FORMS_API = 'https://forms.googleapis.com/v1'
+DRIVE_API = 'https://www.googleapis.com/drive/v3'
+
+# Connection pool limits for the shared session
+MAX_CONNECTIONS = 32
+KEEPALIVE_SECONDS = 60
+REQUEST_TIMEOUT = 120
+
+class GoogleApiError(Exception):
+    """Non-2xx response from a Google API"""
+
+    def __init__(self, status, message, retry_after=None):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+class AsyncFormsClient:
+    def __init__(self, max_connections=MAX_CONNECTIONS):
+        self.max_connections = max_connections
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so it binds to the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=KEEPALIVE_SECONDS)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            )
+        return self._session
+
+    async def _token(self) -> str:
+        return google_clients.cached_token() or await run_io(google_clients.access_token)
+
+    async def request(self, method, url, body=None, params=None, api='forms', user=None) -> dict:
+        """One API call, paced by the shared rate limiter"""
+        await rate_limiter.acquire_async(api, user)
+        headers = {"Authorization": f"Bearer {await self._token()}"}
+        async with self._get_session().request(method, url, json=body, params=params, headers=headers) as response:
+            if response.status >= 400:
+                try:
+                    message = (await response.json())["error"]["message"]
+                except Exception:
+                    message = (await response.text())[:200] or response.reason
+                raise GoogleApiError(response.status, message, response.headers.get('Retry-After'))
+            if response.status == 204:
+                return {}
+            return await response.json()
+
+    async def create_form(self, title, user=None) -> dict:
+        return await self.request('POST', f"{FORMS_API}/forms", {"info": {"title": title}}, user=user)
+
+    async def get_form(self, form_id, fields=None, user=None) -> dict:
+        params = {"fields": fields} if fields else None
+        return await self.request('GET', f"{FORMS_API}/forms/{form_id}", params=params, user=user)
+
+    async def batch_update(self, form_id, requests, user=None, revision_id=None) -> dict:
+        body = {"requests": requests}
+        if revision_id:
+            # Rejected (400) if the form changed since that revision
+            body["writeControl"] = {"requiredRevisionId": revision_id}
+        return await self.request('POST', f"{FORMS_API}/forms/{form_id}:batchUpdate", body, user=user)
+
+    async def list_responses(self, form_id, page_token=None, response_filter=None, user=None,
+                             page_size=google_forms_api.RESPONSES_PAGE_SIZE) -> dict:
+        params = {"pageSize": page_size}
+        if page_token:
+            params["pageToken"] = page_token
+        if response_filter:
+            params["filter"] = response_filter
+        return await self.request('GET', f"{FORMS_API}/forms/{form_id}/responses", params=params, user=user)
+
+    async def copy_file(self, file_id, name, user=None) -> dict:
+        return await self.request('POST', f"{DRIVE_API}/files/{file_id}/copy", {"name": name},
+                                  params={"fields": "id"}, api='drive', user=user)
+
+    async def rename_file(self, file_id, name, user=None) -> dict:
+        return await self.request('PATCH', f"{DRIVE_API}/files/{file_id}", {"name": name},
+                                  params={"fields": "id"}, api='drive', user=user)
+
+    async def delete_file(self, file_id, user=None) -> dict:
+        return await self.request('DELETE', f"{DRIVE_API}/files/{file_id}", api='drive', user=user)
+
+    async def create_permission(self, file_id, permission, user=None) -> dict:
+        return await self.request('POST', f"{DRIVE_API}/files/{file_id}/permissions", permission, api='drive', user=user)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+_client = None
+
+def get_client() -> AsyncFormsClient:
+    global _client
+    if _client is None:
+        _client = AsyncFormsClient()
+    return _client
+
+async def close_client():
+    if _client is not None:
+        await _client.close()
+
+def _failure(error):
+    """(retryable, status, retry_after) for an exception from the client"""
+    if isinstance(error, GoogleApiError):
+        return error.status in RETRYABLE_STATUSES, error.status, error.retry_after
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)), None, None
+
+async def call_with_retry(make_call, what="Google API call"):
+    """Await make_call() (a fresh coroutine per try), retrying on quota and
+    server errors with the backoff of google_forms_api.retry_delay"""
+    for attempt in range(google_forms_api.MAX_RETRIES + 1):
+        try:
+            return await make_call()
+        except Exception as error:
+            retryable, status, retry_after = _failure(error)
+            if not retryable or attempt == google_forms_api.MAX_RETRIES:
+                raise
+            delay = retry_delay(attempt, retry_after)
+            print(f"⚠️ {what} failed ({status or type(error).__name__}), retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+async def count_form_items_async(form_id, client=None, user=None) -> int:
+    client = client or get_client()
+    form = await call_with_retry(lambda: client.get_form(form_id, 'items(itemId)', user), "forms.get")
+    return len(form.get('items', []))
+
+async def add_form_items_async(form_id, questions, start=0, prefix=(), client=None, user=None) -> int:
+    """Add questions[start:] to a form in chunks; returns the number of
+    questions on the form. prefix requests (form info) go with the first chunk.
+
+    Each chunk is retried on quota and server errors. A 5xx or a dropped
+    connection may still have applied the chunk, so before resending, the
+    form's item count is read back and adding resumes from there - an item
+    is never added twice. Raises FormItemsError once retries run out.
+    """
+    client = client or get_client()
+    prefix = list(prefix)
+    committed = start
+    attempt = 0
+    resync = False
+    while committed < len(questions) or prefix:
+        stop = committed
+        try:
+            if resync:
+                committed = await count_form_items_async(form_id, client, user)
+                resync = False
+                if committed > start:
+                    prefix = []
+                if committed >= len(questions) and not prefix:
+                    break
+            requests, stop = next_item_chunk(questions, committed, prefix)
+            await client.batch_update(form_id, requests, user)
+        except Exception as error:
+            retryable, status, retry_after = _failure(error)
+            if not retryable or attempt == google_forms_api.MAX_RETRIES:
+                raise FormItemsError(committed, error) from error
+            delay = retry_delay(attempt, retry_after)
+            attempt += 1
+            print(f"⚠️ Adding questions {committed + 1}-{stop} failed ({status or type(error).__name__}), "
+                  f"retry {attempt} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            # A 429 was rejected outright; anything else may have been applied
+            resync = status != 429
+            continue
+        print(f"Added questions {committed + 1}-{stop} of {len(questions)}")
+        committed = stop
+        prefix = []
+        attempt = 0
+    return committed
+
+async def share_form_async(form_id, client=None, user=None):
+    """Give anyone with the link access to the form; returns the role granted or None"""
+    client = client or get_client()
+    for role in SHARE_ROLES:
+        try:
+            # Quota errors are retried for this role; only a refusal moves on to the next one
+            await call_with_retry(lambda: client.create_permission(form_id, {'type': 'anyone', 'role': role}, user),
+                                  "drive.permissions.create")
+            print(f"Form shared - anyone with link is a {role}")
+            return role
+        except Exception as e:
+            # The form itself is fine; an unshared one is still returned
+            print(f"Warning: Could not share form as {role}: {str(e) or type(e).__name__}")
+    return None
+
+async def rename_form_async(form_id, name, client=None, user=None):
+    """Set the form's Drive file name, which updateFormInfo leaves as it was
+    at creation; a failure is only a warning"""
+    client = client or get_client()
+    try:
+        await call_with_retry(lambda: client.rename_file(form_id, name, user), "drive.files.update")
+    except Exception as e:
+        print(f"Warning: Could not rename form {form_id}: {str(e) or type(e).__name__}")
+
+async def delete_form_async(form_id, client=None, user=None) -> bool:
+    """Move a form to the Drive trash; a failure is only a warning"""
+    client = client or get_client()
+    try:
+        await call_with_retry(lambda: client.delete_file(form_id, user), "drive.files.delete")
+        return True
+    except Exception as e:
+        print(f"Warning: Could not delete form {form_id}: {str(e) or type(e).__name__}")
+        return False
+
+async def _timed(timings, step, awaitable):
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[step] = time.perf_counter() - start
+
+async def create_google_form_async(questions, form_title="Exam Questions", user_email=None, user=None,
+                                   template_id=None):
+    """Create a Google Form for questions.
+
+    Two round trips end to end for a normal exam: forms.create, then the
+    description and all items in one batchUpdate while the Drive sharing
+    call runs alongside it. Big exams are added in retried chunks (see
+    add_form_items_async); if that gives up, or anything else fails once the
+    form exists, the half-built form is deleted and only the error is
+    returned. The result carries per-step timings in seconds. user (the Telegram user id) is the
+    caller's key in the rate limiter's fair queue.
+
+    With template_id the form starts as a drive.files.copy of that form, so
+    its quiz settings and description come along and only the title and
+    items are written. The template must not contain any items. Drive does
+    not copy permissions, so the copy is still shared alongside the update.
+    """
+    client = get_client()
+    timings = {}
+    started = time.perf_counter()
+    share = None
+    form_id = None
+    built = False
+    try:
+        if template_id:
+            print(f"Copying form template {template_id} as: {form_title}")
+            copied = await _timed(timings, "create", call_with_retry(
+                lambda: client.copy_file(template_id, form_title, user), "drive.files.copy"))
+            form_id = copied['id']
+            # The copy keeps the template's form title; its description stays
+            info_requests = [title_request(form_title)]
+        else:
+            print(f"Creating form with title: {form_title}")
+            result = await _timed(timings, "create", call_with_retry(lambda: client.create_form(form_title, user), "forms.create"))
+            form_id = result['formId']
+            info_requests = [description_request()]
+        print(f"Form created successfully with ID: {form_id}")
+
+        share = asyncio.create_task(_timed(timings, "share", share_form_async(form_id, client, user)))
+        print(f"Adding {len(questions)} questions to form...")
+        await _timed(timings, "update", add_form_items_async(form_id, questions, prefix=info_requests, client=client, user=user))
+        print("Questions added successfully!")
+        # A sharing failure is only a warning: the form is built and worth returning
+        if await share is None:
+            print(f"⚠️ Form {form_id} could not be shared with anyone who has the link")
+
+        timings["total"] = time.perf_counter() - started
+        print(format_timings(timings))
+        built = True
+        return {**form_urls(form_id), "success": True, "timings": timings}
+
+    except (GoogleApiError, FormItemsError) as error:
+        print(f"Google Forms API error: {error}")
+        return {
+            "success": False,
+            "error": f"Google Forms API error: {str(error)}"
+        }
+    except Exception as error:
+        print(f"Unexpected error: {error}")
+        return {
+            "success": False,
+            "error": f"Unexpected error: {str(error)}"
+        }
+    finally:
+        # The form failed: don't leave the sharing call running unobserved,
+        # nor a half-built form in the service account's Drive
+        if share is not None and not share.done():
+            share.cancel()
+        if form_id is not None and not built:
+            if await delete_form_async(form_id, client, user):
+                print(f"Deleted unfinished form {form_id}")
+
+async def fill_form_async(form_id, questions, form_title, user=None, description=FORM_DESCRIPTION):
+    """Write the title, description and questions into an existing empty,
+    already shared form (e.g. from form_pool). Same result dict as
+    create_google_form_async."""
+    timings = {}
+    started = time.perf_counter()
+    try:
+        print(f"Filling form {form_id} with {len(questions)} questions: {form_title}")
+        await _timed(timings, "update", add_form_items_async(
+            form_id, questions, prefix=[form_info_request(form_title, description)], user=user))
+        timings["total"] = time.perf_counter() - started
+        print(format_timings(timings))
+        return {**form_urls(form_id), "success": True, "timings": timings}
+    except FormItemsError as error:
+        print(f"Google Forms API error: {error}")
+        return {
+            **form_urls(form_id),
+            "success": False,
+            "committed": error.committed,
+            "error": f"Google Forms API error: {str(error)}"
+        }
+    except Exception as error:
+        print(f"Unexpected error: {error}")
+        return {
+            "success": False,
+            "error": f"Unexpected error: {str(error)}"
+        }
+
+async def iter_form_responses_async(form_id, since=None, client=None, user=None):
+    """asyncio version of google_forms_api.iter_form_responses"""
+    client = client or get_client()
+    page_token = None
+    while True:
+        page = await call_with_retry(
+            lambda: client.list_responses(form_id, page_token, responses_filter(since), user), "forms.responses.list")
+        for response in page.get('responses', []):
+            yield response
+        page_token = page.get('nextPageToken')
+        if not page_token:
+            return
+
+async def read_form_items(form_id, questions, form_title, user=None):
+    """Item ids of a form just filled with questions, in the shape
+    update_google_form_async takes (None if the form holds other items)"""
+    form = await call_with_retry(lambda: get_client().get_form(form_id, 'items(itemId)', user), "forms.get")
+    item_ids = [item['itemId'] for item in form.get('items', [])]
+    if len(item_ids) != len(questions):
+        return None
+    return {
+        "form_id": form_id,
+        "title": form_title,
+        "items": [[item_id, normalize_question(question)] for item_id, question in zip(item_ids, questions)],
+    }
+
+async def form_exists_async(form_id, user=None) -> bool:
+    """False only when Google says the form is gone (e.g. deleted in Drive);
+    any other error can't tell, so the form is assumed to be there"""
+    try:
+        await call_with_retry(lambda: get_client().get_form(form_id, 'formId', user), "forms.get")
+        return True
+    except GoogleApiError as error:
+        return error.status != 404
+    except Exception:
+        return True
+
+async def update_google_form_async(form, questions, form_title, user=None):
+    """Make an existing form (a read_form_items dict) show questions, with
+    one batchUpdate holding only the changed items.
+
+    The form's items are read back first: if they are no longer the stored
+    ones (edited outside the bot) or the changes don't fit in one batch, it
+    fails without touching the form and callers create a new one. The batch
+    is pinned to the revision just read, so an edit in between fails it too.
+    On success the result carries the updated "form" dict and the number of
+    "changes"; a failure because the form no longer exists has "missing": True.
+    """
+    client = get_client()
+    form_id = form["form_id"]
+    requests, sources = diff_form_items([question for _, question in form["items"]], questions)
+    if form_title != form["title"]:
+        requests.insert(0, title_request(form_title))
+    if len(requests) > google_forms_api.MAX_BATCH_REQUESTS or \
+            len(json.dumps(requests)) > google_forms_api.MAX_BATCH_BYTES:
+        return {**form_urls(form_id), "success": False,
+                "error": f"{len(requests)} changes are too many for an in-place update"}
+
+    updated = {**form, "title": form_title}
+    try:
+        if requests:
+            # Revision ids are only good for about a day, so take the current
+            # one rather than one stored when the form was made
+            live = await call_with_retry(
+                lambda: client.get_form(form_id, 'revisionId,items(itemId,title)', user), "forms.get")
+            live_items = [[item['itemId'], ' '.join(item.get('title', '').split())] for item in live.get('items', [])]
+            if live_items != [[item_id, question["text"]] for item_id, question in form["items"]]:
+                return {**form_urls(form_id), "success": False, "error": "The form was edited outside the bot"}
+
+            print(f"Updating form {form_id}: {len(requests)} changes for {len(questions)} questions")
+            # One batch is applied atomically, so a failed update leaves the form as it was
+            reply = await call_with_retry(
+                lambda: client.batch_update(form_id, requests, user, live.get('revisionId')), "forms.batchUpdate")
+            created = iter(r["createItem"]["itemId"] for r in reply.get("replies", []) if "createItem" in r)
+        else:
+            created = iter(())
+        item_ids = [form["items"][source][0] if source is not None else next(created) for source in sources]
+    except GoogleApiError as error:
+        print(f"Google Forms API error: {error}")
+        return {**form_urls(form_id), "success": False, "missing": error.status == 404,
+                "error": f"Google Forms API error: {str(error)}"}
+    except Exception as error:
+        print(f"Unexpected error: {error}")
+        return {"success": False, "error": f"Unexpected error: {str(error)}"}
+
+    updated["items"] = [[item_id, normalize_question(question)] for item_id, question in zip(item_ids, questions)]
+    return {**form_urls(form_id), "success": True, "form": updated, "changes": len(requests)}
@@ -0,0 +1,119 @@
+"""
+Document ingestion: pick a reader by MIME type / file extension and feed the
+text to the streaming question parser.
+
+    kind = detect_kind(document.mime_type, document.file_name)   # 'pdf', 'docx', 'text' or None
+    questions, stats = stream_document_questions(data, kind)     # text and .docx
+
+Text files are decoded in chunks and .docx paragraphs are read one at a time
+from the zip, so a large question bank never pays PDF extraction costs and
+is never held as one big string. PDFs keep the pdf_extractor pipeline.
+"""
+import io
+import os
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+from parser import iter_questions
+
+DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+MIME_KINDS = {
+    'application/pdf': 'pdf',
+    DOCX_MIME: 'docx',
+}
+
+EXTENSION_KINDS = {
+    '.pdf': 'pdf',
+    '.docx': 'docx',
+    '.txt': 'text',
+    '.text': 'text',
+    '.md': 'text',
+}
+
+TEXT_CHUNK_CHARS = 64 * 1024
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+class UnsupportedDocumentError(ValueError):
+    """Raised for documents no reader can handle"""
+
+def detect_kind(mime_type=None, file_name=None):
+    """'pdf', 'docx', 'text' or None. The MIME type wins; the extension
+    covers clients that send everything as application/octet-stream."""
+    mime_type = (mime_type or '').split(';')[0].strip().lower()
+    if mime_type in MIME_KINDS:
+        return MIME_KINDS[mime_type]
+    if mime_type.startswith('text/'):
+        return 'text'
+    extension = os.path.splitext(file_name or '')[1].lower()
+    return EXTENSION_KINDS.get(extension)
+
+def _sniff_encoding(data) -> str:
+    if data[:3] == b'\xef\xbb\xbf':
+        return 'utf-8-sig'
+    if data[:2] in (b'\xff\xfe', b'\xfe\xff'):
+        return 'utf-16'
+    sample = bytes(data[:TEXT_CHUNK_CHARS])
+    try:
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the sample boundary is still UTF-8
+        if e.start < len(sample) - 3:
+            return 'cp1252'
+    return 'utf-8'
+
+def iter_text_chunks(data, chunk_chars=TEXT_CHUNK_CHARS):
+    """Decode text bytes chunk by chunk with universal newlines"""
+    stream = io.TextIOWrapper(io.BytesIO(data), encoding=_sniff_encoding(data), errors='replace', newline=None)
+    while True:
+        chunk = stream.read(chunk_chars)
+        if not chunk:
+            return
+        yield chunk
+
+def iter_docx_paragraphs(data):
+    """Yield each paragraph of a .docx body (tables included) as a line"""
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        body = archive.open('word/document.xml')
+    except (zipfile.BadZipFile, KeyError):
+        raise UnsupportedDocumentError("Not a valid .docx file")
+
+    with archive, body:
+        for _, element in iterparse(body, events=('end',)):
+            if element.tag != _W + 'p':
+                continue
+            parts = []
+            for node in element.iter():
+                if node.tag == _W + 't' and node.text:
+                    parts.append(node.text)
+                elif node.tag == _W + 'tab':
+                    parts.append('\t')
+                elif node.tag in (_W + 'br', _W + 'cr'):
+                    parts.append('\n')
+            # Drop the parsed paragraph so memory stays flat
+            element.clear()
+            yield ''.join(parts) + '\n'
+
+def iter_document_text(data, kind):
+    """Text chunks of a 'text' or 'docx' document"""
+    if kind == 'text':
+        return iter_text_chunks(data)
+    if kind == 'docx':
+        return iter_docx_paragraphs(data)
+    raise UnsupportedDocumentError(f"No text reader for {kind or 'this'} documents")
+
+def stream_document_questions(data, kind, time_budget=None):
+    """Parse a text or .docx document. Returns (questions, stats) where stats
+    holds kind, chars and questions_found."""
+    stats = {"kind": kind, "chars": 0, "questions_found": 0}
+
+    def chunks():
+        for chunk in iter_document_text(data, kind):
+            stats["chars"] += len(chunk)
+            yield chunk
+
+    questions = list(iter_questions(chunks(), time_budget))
+    stats["questions_found"] = len(questions)
+    return questions, stats
@@ -1,22 +1,48 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (ApplicationBuilder, CommandHandler, MessageHandler, 
                          CallbackQueryHandler, ContextTypes, filters, ConversationHandler)
-from PyPDF2 import PdfReader
-import tempfile
-import os
+import asyncio
+import time
 import pytz
 from datetime import datetime
 
 # Import modules
 from menu import main_menu_keyboard, back_button, format_menu_keyboard, success_menu_keyboard, form_creation_method_keyboard
-from parser import parse_questions, format_choices
-from google_forms_api import create_google_form
+from parser import format_choices, QuestionType
+from google_forms_async import close_client, form_exists_async, read_form_items, update_google_form_async
+from form_pool import FormPool, create_form_from_pool
+from form_registry import FormRegistry
 from professional_script_generator import generate_simple_apps_script, split_script_into_parts
+from parse_cache import ParseCache
+from pdf_extractor import stream_pdf_questions
+from offload import run_io, run_cpu, cpu_executor
+from document_download import download_document, DocumentTooLargeError
+from pdf_cache import PdfCache, content_hash
+from ingest import detect_kind, stream_document_questions
+import offload
+import google_forms_api
 import config
 
 # Conversation states
 CONVERTING, AWAITING_QUESTIONS, CHOOSING_METHOD = range(3)
 
+# Shared cache of parse results (re-sent texts and re-uploaded PDFs)
+parse_cache = ParseCache(config.PARSE_CACHE_MAX_ENTRIES, config.PARSE_CACHE_MAX_BYTES)
+
+# Empty, already shared forms ready for direct links (filled in by post_init)
+form_pool = FormPool(
+    config.FORM_POOL_SIZE, config.FORM_POOL_MAX_AGE_HOURS * 3600, config.FORM_POOL_FILE, config.FORM_TEMPLATE_ID
+)
+
+# Forms already created, keyed by exam content (repeat requests reuse them)
+form_registry = FormRegistry(config.FORM_REGISTRY_DB)
+
+# Persistent cache of processed PDFs, keyed by file_unique_id and content hash
+pdf_cache = PdfCache(
+    config.PDF_CACHE_DIR, config.PDF_CACHE_MAX_BYTES, config.PDF_CACHE_MAX_AGE_DAYS * 24 * 3600,
+    backend=config.PDF_BACKEND, max_pages=config.PDF_MAX_PAGES
+)
+
 # Enable logging
 import logging
 logging.basicConfig(
@@ -31,7 +57,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"Created by @Anon_0x1 — because who has time to click stuff manually? 😅\n\n"
         "🚀 **What I can do:**\n"
         "• Convert Multiple Choice Questions into Google Forms\n"
-        "• Parse PDF files with MCQ questions\n"
+        "• Parse PDF, Word (.docx) and .txt files with MCQ questions\n"
         "• Generate clean Google Apps Scripts\n"
         "• Support for formatted and unformatted questions\n\n"
         "📝 **Currently Supported:**\n"
@@ -239,6 +265,16 @@ async def button_click(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await handle_direct_form_creation(query, questions, form_title)
         return ConversationHandler.END
 
+    elif query.data == 'method_update':
+        # User chose to apply the questions to their last direct form
+        context.user_data['creation_method'] = 'update'
+        questions = context.user_data.get('parsed_questions', [])
+        form_title = context.user_data.get('form_title', 'Exam Questions')
+        
+        await query.edit_message_text("✏️ Updating your last Google Form...")
+        await handle_form_update(query, questions, form_title)
+        return ConversationHandler.END
+
     elif query.data == 'method_script':
         # User chose Google Apps Script
         context.user_data['creation_method'] = 'script'
@@ -252,7 +288,7 @@ async def button_click(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def handle_direct_form_creation(query, questions, form_title):
     """Handle direct form creation with limitations notice"""
     # Filter only MCQ questions
-    mcq_questions = [q for q in questions if q["type"].name == "MULTIPLE_CHOICE"]
+    mcq_questions = [q for q in questions if q.type == QuestionType.MULTIPLE_CHOICE]
     
     if not mcq_questions:
         message = (
@@ -265,15 +301,28 @@ async def handle_direct_form_creation(query, questions, form_title):
         await query.message.reply_text(message, reply_markup=success_menu_keyboard())
         return
     
-    form_result = create_google_form(mcq_questions, form_title)
+    # The same exam again in this chat gets its existing form; a pooled form
+    # only needs its title and questions written
+    form_result = await form_registry.get_or_create(
+        query.message.chat_id, mcq_questions, form_title,
+        lambda: create_form_from_pool(
+            form_pool, mcq_questions, form_title, user=query.from_user.id, template_id=config.FORM_TEMPLATE_ID
+        ),
+        # A form deleted in Drive since is created again
+        exists=lambda form_id: form_exists_async(form_id, user=query.from_user.id)
+    )
+    print(f"Form pool: {form_pool.stats()}, form registry: {await run_io(form_registry.stats)}")
+    print(f"Google API limiter: {google_forms_api.rate_limiter.metrics()}")
     
     if form_result["success"]:
+        reused_note = "♻️ Same exam as before, so here is its existing form.\n\n" if form_result.get("reused") else ""
         message = (
             f"✅ **Direct Google Form Created!**\n\n"
+            f"{reused_note}"
             f"📋 **Student Link:** {form_result['response_url']}\n\n"
             f"⚠️ **Important Limitations:**\n"
             f"• This form is VIEW-ONLY for responses\n"
-            f"• You cannot edit questions after creation\n"
+            f"• To fix questions later, resend the corrected exam and choose ✏️ Update\n"
             f"• Limited customization options\n\n"
             f"📊 **Form Details:**\n"
             f"• Total MCQ Questions: {len(mcq_questions)}\n"
@@ -291,12 +340,57 @@ async def handle_direct_form_creation(query, questions, form_title):
         )
     
     await query.message.reply_text(message, reply_markup=success_menu_keyboard())
+    if form_result["success"]:
+        await _remember_chat_form(query, form_result["form_id"], mcq_questions, form_title)
+
+async def _remember_chat_form(query, form_id, questions, form_title):
+    """Keep the form's item ids so a corrected exam can update it in place"""
+    try:
+        form = await read_form_items(form_id, questions, form_title, user=query.from_user.id)
+    except Exception as e:
+        print(f"⚠️ Could not read back form {form_id}: {e}")
+        return
+    if form is not None:
+        await run_io(form_registry.remember_chat_form, query.message.chat_id, form)
+
+async def handle_form_update(query, questions, form_title):
+    """Apply corrected questions to the chat's last direct form in place,
+    falling back to a new form when that isn't possible"""
+    mcq_questions = [q for q in questions if q.type == QuestionType.MULTIPLE_CHOICE]
+    chat_id = query.message.chat_id
+    form = await run_io(form_registry.chat_form, chat_id)
+    if not mcq_questions or form is None:
+        await handle_direct_form_creation(query, questions, form_title)
+        return
+    
+    form_result = await update_google_form_async(form, mcq_questions, form_title, user=query.from_user.id)
+    if not form_result["success"]:
+        print(f"⚠️ In-place update of {form['form_id']} failed ({form_result['error']}), creating a new form")
+        if form_result.get("missing"):
+            # Deleted in Drive: don't hand it out again as this exam's form
+            await run_io(form_registry.forget, form["form_id"])
+        await handle_direct_form_creation(query, questions, form_title)
+        return
+    await run_io(form_registry.remember_chat_form, chat_id, form_result["form"])
+    await run_io(form_registry.replace, chat_id, mcq_questions, form_title, form_result)
+    
+    changes = form_result["changes"]
+    message = (
+        f"✏️ **Google Form Updated!**\n\n"
+        f"📋 **Student Link (unchanged):** {form_result['response_url']}\n\n"
+        f"📊 **Form Details:**\n"
+        f"• Total MCQ Questions: {len(mcq_questions)}\n"
+        f"• Changes applied: {changes if changes else 'none, the form was already up to date'}\n"
+        f"• Form ID: {form_result['form_id']}\n\n"
+        f"✨ **Created by @Anon_0x1**"
+    )
+    await query.message.reply_text(message, reply_markup=success_menu_keyboard())
 
 async def handle_script_generation(query, questions, form_title):
     """Handle Google Apps Script generation - FIXED VERSION"""
     try:
         # Filter only MCQ questions
-        mcq_questions = [q for q in questions if q["type"].name == "MULTIPLE_CHOICE"]
+        mcq_questions = [q for q in questions if q.type == QuestionType.MULTIPLE_CHOICE]
         
         if not mcq_questions:
             message = (
@@ -312,7 +406,7 @@ async def handle_script_generation(query, questions, form_title):
         print(f"Generating script for {len(mcq_questions)} MCQ questions...")
         
         # Generate the script
-        script = generate_simple_apps_script(mcq_questions, form_title)
+        script = await run_cpu(generate_simple_apps_script, mcq_questions, form_title)
         
         if not script:
             await query.message.reply_text("❌ Failed to generate script. Please try again.")
@@ -374,33 +468,105 @@ async def handle_script_generation(query, questions, form_title):
         )
         await query.message.reply_text(error_message, reply_markup=success_menu_keyboard())
 
-# Handle PDF uploads
-async def handle_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE):
+async def _edit_progress(status_message, stats):
     try:
-        await update.message.reply_text("📄 Processing your PDF... Please wait!")
-        
-        pdf_file = await update.message.document.get_file()
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            await pdf_file.download_to_drive(temp_file.name)
-
-            reader = PdfReader(temp_file.name)
-            text = '\n'.join([page.extract_text() for page in reader.pages])
+        await status_message.edit_text(
+            f"📄 Processing your PDF... {stats['pages_done']}/{stats['page_count']} pages • "
+            f"{stats['questions_found']} questions found"
+        )
+    except Exception as e:
+        # Progress is best effort ("message is not modified", flood limits...)
+        print(f"Progress update skipped: {e}")
+
+def pdf_progress_reporter(status_message, loop):
+    """Progress callback for stream_pdf_questions(); it runs in a worker
+    thread, so edits are scheduled back onto the event loop, throttled."""
+    last_update = 0.0
+
+    def report(stats):
+        nonlocal last_update
+        now = time.monotonic()
+        if now - last_update < config.PDF_PROGRESS_INTERVAL:
+            return
+        last_update = now
+        asyncio.run_coroutine_threadsafe(_edit_progress(status_message, dict(stats)), loop)
+
+    return report
+
+async def _process_pdf(document, status_message):
+    """(questions, stats) for a PDF, from the cache when it was seen before"""
+    file_id = document.file_unique_id
+
+    # A file seen before is answered from the cache without downloading it
+    cached = await run_io(pdf_cache.get, file_id)
+    if cached is None:
+        pdf_bytes = await download_document(document, config.MAX_DOCUMENT_BYTES)
+        digest = await run_io(content_hash, pdf_bytes)
+        # Same content uploaded as a different file
+        cached = await run_io(pdf_cache.get, file_id, digest)
+
+    if cached is not None:
+        print(f"PDF cache hit: {pdf_cache.stats()}")
+        return cached["questions"], cached["stats"]
+
+    # Pages are extracted lazily (page ranges on the process pool) and
+    # scanned in batches on the same pool; the thread only moves text
+    # between them and waits.
+    questions, stats = await run_io(
+        stream_pdf_questions, pdf_bytes,
+        max_pages=config.PDF_MAX_PAGES,
+        max_seconds=config.PDF_MAX_SECONDS,
+        on_progress=pdf_progress_reporter(status_message, asyncio.get_running_loop()),
+        workers=config.OFFLOAD_CPU_WORKERS,
+        min_pages=config.PDF_PARALLEL_MIN_PAGES,
+        executor=cpu_executor(),
+        backend=config.PDF_BACKEND
+    )
+    # A time-limited result depends on load, so it is not worth keeping
+    if stats["stop_reason"] != "time":
+        await run_io(pdf_cache.put, digest, questions, stats, file_id)
+    return questions, stats
+
+# Wording used in replies for each kind of document
+DOCUMENT_LABELS = {'pdf': 'PDF', 'docx': 'Word document', 'text': 'text file'}
+
+# Handle document uploads (PDF, .docx and plain text)
+async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    document = update.message.document
+    # Dispatch before downloading, so unsupported files cost nothing
+    kind = detect_kind(document.mime_type, document.file_name)
+    if kind is None:
+        await update.message.reply_text("❌ Unsupported file type. Please send a PDF, .docx or .txt file.\n\n✨ Created by @Anon_0x1")
+        return
+    label = DOCUMENT_LABELS[kind]
+    print(f"Document {document.file_name!r} ({document.mime_type}) -> {kind}")
 
-        os.unlink(temp_file.name)
+    try:
+        status_message = await update.message.reply_text(f"📄 Processing your {label}... Please wait!")
 
-        if not text.strip():
-            await update.message.reply_text("❌ Could not extract text from PDF. Please make sure it's not a scanned image.")
-            return
+        if kind == 'pdf':
+            questions, stats = await _process_pdf(document, status_message)
+        else:
+            # Text banks skip PDF extraction and go straight to the parser
+            data = await download_document(document, config.MAX_DOCUMENT_BYTES)
+            questions, stats = await run_cpu(stream_document_questions, data, kind, config.PARSE_TIME_BUDGET)
+        print(f"{label} stats: {stats}")
+
+        if not questions:
+            if not stats["chars"]:
+                if kind == 'pdf':
+                    await update.message.reply_text("❌ Could not extract text from PDF. Please make sure it's not a scanned image.")
+                else:
+                    await update.message.reply_text(f"❌ Your {label} is empty.")
+                return
+            raise ValueError("No valid questions found in the input")
 
-        questions = parse_questions(text)
-        
         # Filter only MCQ questions
-        mcq_questions = [q for q in questions if q["type"].name == "MULTIPLE_CHOICE"]
+        mcq_questions = [q for q in questions if q.type == QuestionType.MULTIPLE_CHOICE]
         
         if not mcq_questions:
             message = (
-                f"❌ **No MCQ Questions Found in PDF**\n\n"
+                f"❌ **No MCQ Questions Found in {label}**\n\n"
                 f"Currently, we only support Multiple Choice Questions.\n\n"
                 f"🔄 **Other question types coming soon!**\n"
                 f"✨ **Created by @Anon_0x1**\n"
@@ -411,12 +577,21 @@ async def handle_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # Store questions and show method selection
         context.user_data['parsed_questions'] = mcq_questions
-        context.user_data['form_title'] = "PDF Exam Questions"
+        context.user_data['form_title'] = "PDF Exam Questions" if kind == 'pdf' else "Exam Questions"
+        
+        truncated_note = ""
+        if stats.get("truncated"):
+            limit = "page" if stats["stop_reason"] == "pages" else "time"
+            truncated_note = (
+                f"⚠️ **Partial result:** stopped at the {limit} limit after "
+                f"{stats['pages_done']} of {stats['page_count']} pages.\n\n"
+            )
         
         method_message = (
-            f"✅ **PDF Processed Successfully!**\n\n"
+            f"✅ **{label[0].upper() + label[1:]} Processed Successfully!**\n\n"
             f"📊 **Found:** {len(mcq_questions)} MCQ questions\n"
             f"📝 **Type:** Multiple Choice Questions\n\n"
+            f"{truncated_note}"
             f"🎯 **Choose your preferred creation method:**\n\n"
             f"🔗 **Direct Link:** Quick form creation, but view-only access\n"
             f"📝 **Google Script:** Full edit access, clean code (Recommended)\n\n"
@@ -424,13 +599,16 @@ async def handle_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"✨ **Created by @Anon_0x1**"
         )
         
-        await update.message.reply_text(method_message, reply_markup=form_creation_method_keyboard())
+        can_update = await run_io(form_registry.chat_form, update.effective_chat.id) is not None
+        await update.message.reply_text(method_message, reply_markup=form_creation_method_keyboard(can_update))
         return CHOOSING_METHOD
             
+    except DocumentTooLargeError as e:
+        await update.message.reply_text(f"❌ {str(e)}. Please split it into smaller files.\n\n✨ Created by @Anon_0x1")
     except ValueError as e:
-        await update.message.reply_text(f"❌ Error: {str(e)}\nPlease make sure your PDF contains properly formatted MCQ questions.\n\n✨ Created by @Anon_0x1")
+        await update.message.reply_text(f"❌ Error: {str(e)}\nPlease make sure your {label} contains properly formatted MCQ questions.\n\n✨ Created by @Anon_0x1")
     except Exception as e:
-        await update.message.reply_text(f"❌ Sorry, I couldn't process your PDF. Error: {str(e)}\n\n✨ Created by @Anon_0x1")
+        await update.message.reply_text(f"❌ Sorry, I couldn't process your {label}. Error: {str(e)}\n\n✨ Created by @Anon_0x1")
 
 # Handle unformatted questions
 async def handle_unformatted_questions(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -490,22 +668,23 @@ async def handle_unformatted_questions(update: Update, context: ContextTypes.DEF
 
 # Handle user messages
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    if update.message.document and update.message.document.mime_type == 'application/pdf':
-        await handle_pdf(update, context)
+    if update.message.document:
+        await handle_document(update, context)
         return
 
     text = update.message.text
     if not text:
-        await update.message.reply_text("❌ Please send me a text message with questions or a PDF file.\n\n✨ Created by @Anon_0x1")
+        await update.message.reply_text("❌ Please send me a text message with questions or a PDF, .docx or .txt file.\n\n✨ Created by @Anon_0x1")
         return
 
     try:
         await update.message.reply_text("🔄 Processing your questions...")
         
-        questions = parse_questions(text)
+        questions = await run_io(parse_cache.parse, text, config.PARSE_TIME_BUDGET, executor=cpu_executor())
+        print(f"Parse cache: {parse_cache.stats()}")
         
         # Filter only MCQ questions
-        mcq_questions = [q for q in questions if q["type"].name == "MULTIPLE_CHOICE"]
+        mcq_questions = [q for q in questions if q.type == QuestionType.MULTIPLE_CHOICE]
         
         if not mcq_questions:
             message = (
@@ -533,7 +712,8 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"✨ **Created by @Anon_0x1**"
         )
         
-        await update.message.reply_text(method_message, reply_markup=form_creation_method_keyboard())
+        can_update = await run_io(form_registry.chat_form, update.effective_chat.id) is not None
+        await update.message.reply_text(method_message, reply_markup=form_creation_method_keyboard(can_update))
             
     except ValueError as e:
         await update.message.reply_text(f"❌ Error: {str(e)}\nPlease check your MCQ question format and try again.\n\n✨ Created by @Anon_0x1")
@@ -551,9 +731,26 @@ def success_menu_keyboard():
     return InlineKeyboardMarkup(keyboard)
 
 # Run the bot
+async def _post_init(app):
+    await form_pool.start()
+
+async def _post_shutdown(app):
+    await form_pool.stop()
+    await close_client()
+    form_registry.close()
+
 def main():
     try:
-        app = ApplicationBuilder().token(config.TELEGRAM_BOT_TOKEN).build()
+        app = (
+            ApplicationBuilder().token(config.TELEGRAM_BOT_TOKEN)
+            .post_init(_post_init).post_shutdown(_post_shutdown).build()
+        )
+        offload.configure(config.OFFLOAD_IO_WORKERS, config.OFFLOAD_CPU_WORKERS)
+        google_forms_api.configure(
+            config.FORMS_BATCH_MAX_REQUESTS, config.FORMS_BATCH_MAX_BYTES, config.FORMS_MAX_RETRIES,
+            rate_limits={'forms': config.FORMS_REQUESTS_PER_MINUTE, 'drive': config.DRIVE_REQUESTS_PER_MINUTE},
+            rate_burst=config.GOOGLE_RATE_BURST
+        )
         print("✅ Bot initialized successfully!")
         print("✨ Created by @Anon_0x1")
         
@@ -589,7 +786,7 @@ def main():
     app.add_handler(conv_handler)
     app.add_handler(CallbackQueryHandler(button_click))
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
-    app.add_handler(MessageHandler(filters.Document.ALL, handle_pdf))
+    app.add_handler(MessageHandler(filters.Document.ALL, handle_document))
 
     print("🚀 Starting bot polling...")
     print("Press Ctrl+C to stop the bot")
@@ -604,6 +801,8 @@ def main():
         print("✨ Created by @Anon_0x1")
     except Exception as e:
         print(f"❌ Error running bot: {str(e)}")
+    finally:
+        offload.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -26,13 +26,16 @@ def format_menu_keyboard():
     ]
     return InlineKeyboardMarkup(keyboard)
 
-def form_creation_method_keyboard():
-    """Menu to choose form creation method"""
+def form_creation_method_keyboard(can_update=False):
+    """Menu to choose form creation method (can_update: the chat has a direct
+    form that can be updated in place)"""
     keyboard = [
         [InlineKeyboardButton("🔗 Direct Google Form Link", callback_data='method_direct')],
         [InlineKeyboardButton("📝 Google Apps Script (Recommended)", callback_data='method_script')],
         [InlineKeyboardButton("⬅️ Back to Menu", callback_data='back')]
     ]
+    if can_update:
+        keyboard.insert(1, [InlineKeyboardButton("✏️ Update My Last Direct Form", callback_data='method_update')])
     return InlineKeyboardMarkup(keyboard)
 
 def success_menu_keyboard():
@@ -0,0 +1,61 @@
+"""
+Offload layer that keeps blocking work off the bot's asyncio event loop.
+
+    rows = await run_io(get_form_responses, form_id)                # blocking I/O -> threads
+    script = await run_cpu(generate_simple_apps_script, questions)  # CPU work -> processes
+
+Functions sent to run_cpu() and their arguments must be picklable.
+"""
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+_io_workers = 16
+_cpu_workers = os.cpu_count() or 1
+_io_executor = None
+_cpu_executor = None
+
+def configure(io_workers=None, cpu_workers=None):
+    """Set pool sizes; call before the first run_io()/run_cpu()"""
+    global _io_workers, _cpu_workers
+    if io_workers:
+        _io_workers = io_workers
+    if cpu_workers:
+        _cpu_workers = cpu_workers
+
+def io_executor() -> ThreadPoolExecutor:
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=_io_workers, thread_name_prefix='offload-io')
+    return _io_executor
+
+def cpu_executor() -> ProcessPoolExecutor:
+    global _cpu_executor
+    if _cpu_executor is None:
+        # Forking a process that already runs the bot's threads can deadlock
+        # the child; forkserver/spawn start workers from a clean process.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        _cpu_executor = ProcessPoolExecutor(max_workers=_cpu_workers, mp_context=context)
+    return _cpu_executor
+
+async def run_io(func, *args, **kwargs):
+    """Run blocking I/O (network calls, disk, waiting on pool futures) in a thread"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor(), functools.partial(func, *args, **kwargs))
+
+async def run_cpu(func, *args, **kwargs):
+    """Run CPU-bound work in a worker process"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(cpu_executor(), functools.partial(func, *args, **kwargs))
+
+def shutdown():
+    global _io_executor, _cpu_executor
+    if _io_executor is not None:
+        _io_executor.shutdown(wait=False, cancel_futures=True)
+        _io_executor = None
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=False, cancel_futures=True)
+        _cpu_executor = None
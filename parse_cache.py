@@ -0,0 +1,100 @@
+"""
+Content-addressed LRU cache in front of the question parser.
+
+Teachers often resend the same text or re-upload the same PDF; a hit returns
+the previously parsed questions without running the parser again.
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+from parser import parse_questions_parallel, DEFAULT_TIME_BUDGET
+
+def normalize_text(text: str) -> str:
+    """Normalise text the way the parser sees it (line-edge whitespace and
+    line endings never change the parse), so trivial re-sends still hit."""
+    return '\n'.join(line.strip() for line in text.strip().replace('\r\n', '\n').split('\n'))
+
+def text_key(text: str) -> str:
+    """Cache key for a document: hash of its normalised text"""
+    return hashlib.blake2b(normalize_text(text).encode('utf-8'), digest_size=16).hexdigest()
+
+def estimate_size(questions) -> int:
+    """Rough number of bytes a parsed question list keeps alive"""
+    size = sys.getsizeof(questions)
+    for question in questions:
+        size += sys.getsizeof(question) + sys.getsizeof(question.text) + sys.getsizeof(question.choices)
+        for choice in question.choices:
+            size += sys.getsizeof(choice) + sys.getsizeof(choice.text)
+    return size
+
+class ParseCache:
+    """Bounded LRU of parse results, limited by entry count and total bytes.
+
+    Cached questions are shared between callers and must be treated as
+    read-only. Safe to use from several threads.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> (questions tuple, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Cached question list for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[0])
+
+    def put(self, key, questions):
+        size = estimate_size(questions)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (tuple(questions), size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def parse(self, text: str, time_budget: float = DEFAULT_TIME_BUDGET, executor=None):
+        """Parse with caching (in parallel for very large texts, on executor if
+        given); errors are not cached"""
+        key = text_key(text)
+        questions = self.get(key)
+        if questions is None:
+            questions = parse_questions_parallel(text, time_budget=time_budget, executor=executor)
+            self.put(key, questions)
+        return questions
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -1,6 +1,21 @@
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass
 from enum import Enum
 
+# Seconds one document may spend in the parser before it is rejected
+DEFAULT_TIME_BUDGET = 5.0
+
+# Documents shorter than this (in characters, roughly 10k questions) are never
+# parsed in parallel; below it process start-up and pickling cost more than
+# they save.
+PARALLEL_MIN_CHARS = 1_000_000
+
+class ParseTimeoutError(ValueError):
+    """Raised when a document exceeds its parsing time budget"""
+
 class QuestionType(Enum):
     MULTIPLE_CHOICE = "MULTIPLE_CHOICE"
     TRUE_FALSE = "TRUE_FALSE"
@@ -8,6 +23,74 @@ class QuestionType(Enum):
     CHECKBOX = "CHECKBOX"
     DROPDOWN = "DROPDOWN"
 
+@dataclass(frozen=True, slots=True)
+class Choice:
+    """One answer option, stored already split into letter and text"""
+    letter: str
+    text: str
+
+    @classmethod
+    def from_string(cls, choice: str, index: int = 0):
+        """Build from 'A. Paris'; unlettered text gets the letter for its index"""
+        choice = choice.strip()
+        if len(choice) >= 2 and choice[0].isalpha() and choice[1] in '.)':
+            return cls(choice[0].upper(), choice[2:].strip())
+        return cls(chr(65 + index), choice)
+
+    def __str__(self):
+        return f"{self.letter}. {self.text}"
+
+@dataclass(slots=True)
+class Question:
+    """A parsed question. correct_index points into choices (-1 when unknown)."""
+    text: str
+    type: QuestionType
+    choices: tuple
+    correct_index: int = -1
+    number: int = 0
+
+    @property
+    def correct_choice(self):
+        return self.choices[self.correct_index] if self.correct_index >= 0 else None
+
+    @property
+    def correct_letter(self) -> str:
+        choice = self.correct_choice
+        return choice.letter if choice else ""
+
+    @property
+    def correct_text(self) -> str:
+        choice = self.correct_choice
+        return choice.text if choice else ""
+
+    def set_correct_letter(self, letter: str):
+        """Mark the choice with this letter as correct (ignored if there is none)"""
+        letter = letter.upper()
+        for idx, choice in enumerate(self.choices):
+            if choice.letter == letter:
+                self.correct_index = idx
+                return
+
+    def to_dict(self) -> dict:
+        """JSON-friendly form (see from_dict)"""
+        return {
+            "number": self.number,
+            "text": self.text,
+            "type": self.type.value,
+            "choices": [{"letter": choice.letter, "text": choice.text} for choice in self.choices],
+            "correct_index": self.correct_index,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            data["text"],
+            QuestionType(data["type"]),
+            tuple(Choice(choice["letter"], choice["text"]) for choice in data["choices"]),
+            data.get("correct_index", -1),
+            data.get("number", 0),
+        )
+
 def detect_question_type(question: str) -> QuestionType:
     """Detect question type from the question text"""
     question_lower = question.lower()
@@ -130,25 +213,302 @@ def parse_inline_choices_bulletproof(text: str) -> list:
     print(f"DEBUG: ALL METHODS FAILED for: '{text}'")
     return []
 
+# Line-level tokens recognised by the single-pass scanner. Every pattern is
+# anchored or guarded (e.g. the (?<!\d) lookbehind) so a scan stays linear
+# even on hostile input such as long digit or whitespace runs.
+QUESTION_START_RE = re.compile(r'\s*(\d+)\.\s*')
+# Key patterns never cross a line break, so matching them per line (scanner)
+# or over the whole text (find_answer_key) gives the same result.
+ANSWER_KEY_RE = re.compile(r'answer[ \t]+key[ \t]*:?', re.IGNORECASE)
+ANSWER_ENTRY_RE = re.compile(r'(?<!\d)(\d+)\.[ \t]*([A-Za-z])(?![A-Za-z])')
+# A line that the scanner will treat as the start of a question
+QUESTION_BOUNDARY_RE = re.compile(r'\n[ \t]*\d+\.')
+CHOICE_MARKER_RE = re.compile(r'[A-Za-z][.)]')
+INLINE_ANSWER_RE = re.compile(r'\s*(?:correct(?:\s+answer)?|answer|ans)\s*[:\-]\s*(\S.*)', re.IGNORECASE)
+INLINE_ANSWER_LETTER_RE = re.compile(r'([A-Za-z])(?:[.)]|\s|$)')
+
+@dataclass(slots=True)
+class AnswerKey:
+    """An 'Answer Key:' section; text[start:end] covers it, text[:start] is the body"""
+    start: int
+    end: int
+    answers: dict
+
+def _parse_answer_entries(text: str, pos: int, answers: dict) -> int:
+    """Add '1. B' style entries from text[pos:] to answers; returns where the last one ends"""
+    end = pos
+    for match in ANSWER_ENTRY_RE.finditer(text, pos):
+        answers[int(match.group(1))] = match.group(2).upper()
+        end = match.end()
+    return end
+
+def find_answer_key(text: str) -> AnswerKey:
+    """Locate and parse the answer key in one scan.
+
+    When there is no key, start == end == len(text) so text[:start] is still
+    the whole question body.
+    """
+    match = ANSWER_KEY_RE.search(text)
+    if not match:
+        return AnswerKey(len(text), len(text), {})
+    answers = {}
+    end = _parse_answer_entries(text, match.end(), answers)
+    return AnswerKey(match.start(), max(end, match.end()), answers)
+
 def extract_answer_key(text: str) -> dict:
     """Extract answer key from text like 'Answer Key: 1. B 2. C 3. B'"""
-    answers = {}
-    
-    # Look for answer key section
-    answer_key_match = re.search(r'Answer\s+Key\s*:?\s*(.*)', text, re.IGNORECASE | re.DOTALL)
-    if answer_key_match:
-        answer_section = answer_key_match.group(1)
-        print(f"DEBUG: Found answer section: {answer_section}")
-        
-        # Parse individual answers like "1. B", "2. C", etc.
-        answer_matches = re.findall(r'(\d+)\.\s*([A-D])', answer_section, re.IGNORECASE)
-        for q_num, answer_letter in answer_matches:
-            answers[int(q_num)] = answer_letter.upper()
-            print(f"DEBUG: Question {q_num} -> Answer {answer_letter}")
-    
-    return answers
+    return find_answer_key(text).answers
+
+def resolve_inline_answer(answer: str, choices) -> str:
+    """Letter meant by the value of an 'Answer:'/'Correct:' line, '' if none.
+
+    Accepts a letter ('B', 'b)', 'B. London') or the text of a choice.
+    """
+    letter_match = INLINE_ANSWER_LETTER_RE.match(answer)
+    if letter_match:
+        letter = letter_match.group(1).upper()
+        if any(choice.letter == letter for choice in choices):
+            return letter
+    answer = answer.strip().casefold()
+    for choice in choices:
+        if choice.text.casefold() == answer:
+            return choice.letter
+    return ""
+
+DEFAULT_CHOICES = tuple(Choice(letter, f"Option {idx}") for idx, letter in enumerate("ABCD", start=1))
+
+def split_choices(text: str) -> list:
+    """Split 'A. x B. y C. z' into Choice objects in one linear scan.
+
+    Markers must appear in letter order starting at A (any number of letters),
+    use the case of the first marker and sit at a word boundary, so things like
+    'Washington D.C.' inside a choice are not mistaken for a new choice.
+    """
+    if not text:
+        return []
+
+    markers = []
+    expected = 'A'
+    for match in CHOICE_MARKER_RE.finditer(text):
+        start = match.start()
+        letter = text[start]
+        if letter.upper() != expected or (markers and letter.isupper() != markers[0][0].isupper()):
+            continue
+        prev = text[start - 1] if start else ' '
+        # Upper-case markers may be glued to the previous word ("ParisB. London"),
+        # which is how PDF extraction often joins inline choices.
+        if not (prev.isspace() or prev in '(,;' or (letter.isupper() and prev.islower())):
+            continue
+        markers.append((letter, start, match.end()))
+        if expected == 'Z':
+            break
+        expected = chr(ord(expected) + 1)
+
+    choices = []
+    for idx, (letter, _, text_start) in enumerate(markers):
+        text_end = markers[idx + 1][1] if idx + 1 < len(markers) else len(text)
+        choice_text = ' '.join(text[text_start:text_end].split())
+        if choice_text:
+            choices.append(Choice(letter.upper(), choice_text))
+
+    return choices if len(choices) >= 2 else []
+
+def _build_question(number: int, lines: list, inline_answer: str = None) -> Question:
+    """Turn the lines collected for one question into a Question"""
+    question_text = lines[0]
+    choices = split_choices(' '.join(lines[1:])) or DEFAULT_CHOICES
+    question = Question(question_text, detect_question_type(question_text), tuple(choices), number=number)
+    if inline_answer:
+        correct_letter = resolve_inline_answer(inline_answer, question.choices)
+        if correct_letter:
+            question.set_correct_letter(correct_letter)
+    return question
+
+def _check_deadline(deadline):
+    if deadline is not None and time.monotonic() > deadline:
+        raise ParseTimeoutError("Document took too long to parse. Please send fewer questions at a time.")
+
+class _QuestionScanner:
+    """Line-at-a-time state machine behind the single-pass parser.
+
+    feed_line() returns the questions that the line completes,
+    i.e. once the next question number or the answer key shows a question has
+    ended; close() flushes the last one. Only the lines of the question being
+    read are held in memory. 'Answer:'/'Correct:' lines inside a question are
+    applied to it directly; the answer key section overrides them.
+    """
+
+    def __init__(self):
+        self.answer_key = {}
+        self._number = None
+        self._lines = []
+        self._inline_answer = None
+        self._in_answer_key = False
+
+    def _flush(self):
+        finished = ()
+        if self._number is not None and self._lines:
+            finished = (_build_question(self._number, self._lines, self._inline_answer),)
+        self._number = None
+        self._lines = []
+        self._inline_answer = None
+        return finished
+
+    def _feed_question_line(self, line: str):
+        finished = ()
+        start_match = QUESTION_START_RE.match(line)
+        if start_match:
+            finished = self._flush()
+            self._number = int(start_match.group(1))
+            line = line[start_match.end():]
+
+        if self._number is None:
+            return finished
+
+        inline_match = INLINE_ANSWER_RE.match(line) if self._lines else None
+        if inline_match:
+            self._inline_answer = inline_match.group(1)
+            return finished
+
+        line = line.strip()
+        if line:
+            self._lines.append(line)
+        return finished
+
+    def _feed_answer_line(self, line: str, pos: int = 0):
+        _parse_answer_entries(line, pos, self.answer_key)
+
+    def feed_line(self, line: str):
+        if self._in_answer_key:
+            self._feed_answer_line(line)
+            return ()
+
+        key_match = ANSWER_KEY_RE.search(line)
+        if not key_match:
+            return self._feed_question_line(line)
+
+        # Text before 'Answer Key' still belongs to the questions
+        finished = self._feed_question_line(line[:key_match.start()]) + self._flush()
+        self._in_answer_key = True
+        self._feed_answer_line(line, key_match.end())
+        return finished
+
+    def close(self):
+        return self._flush()
+
+def _iter_lines(chunks):
+    """Re-split an iterable of text chunks into lines without joining them"""
+    parts = []
+    for chunk in chunks:
+        start = 0
+        while True:
+            newline = chunk.find('\n', start)
+            if newline == -1:
+                if start < len(chunk):
+                    parts.append(chunk[start:])
+                break
+            parts.append(chunk[start:newline])
+            yield ''.join(parts)
+            parts = []
+            start = newline + 1
+    if parts:
+        yield ''.join(parts)
+
+def _apply_answer_key(questions, answer_key):
+    for question in questions:
+        correct_letter = answer_key.get(question.number)
+        if correct_letter:
+            question.set_correct_letter(correct_letter)
+
+def _scan_questions(chunks, deadline=None):
+    scanner = _QuestionScanner()
+    emitted = []
+
+    for line_no, line in enumerate(_iter_lines(chunks)):
+        if line_no % 256 == 0:
+            _check_deadline(deadline)
+        for question in scanner.feed_line(line):
+            emitted.append(question)
+            yield question
 
-def parse_questions(text: str):
+    for question in scanner.close():
+        emitted.append(question)
+        yield question
+
+    # Final pass: the answer key usually comes last, so answers are filled in
+    # on the questions already handed out.
+    _apply_answer_key(emitted, scanner.answer_key)
+
+    print(f"DEBUG: Scanner parsed {len(emitted)} questions, {len(scanner.answer_key)} answers")
+
+def _scan_batch(scanner, text, final=False):
+    """Feed whole lines of text to scanner; runs in a worker process and
+    returns (scanner, the questions the lines completed)"""
+    questions = []
+    for line in _iter_lines([text]):
+        questions.extend(scanner.feed_line(line))
+    if final:
+        questions.extend(scanner.close())
+    return scanner, questions
+
+# Characters of text handed to a worker per scanning task
+PARSE_BATCH_CHARS = 200_000
+
+def iter_questions_on(executor, chunks, batch_chars: int = PARSE_BATCH_CHARS):
+    """iter_questions() with the scanning done on executor (a process pool).
+
+    Chunks must end in a newline. They are gathered into batches of about
+    batch_chars and scanned in order, the scanner's state travelling with
+    each task, so the calling thread only collects text and waits; the next
+    batch is gathered while the previous one is scanned. Questions are
+    yielded a batch at a time.
+    """
+    scanner = _QuestionScanner()
+    emitted = []
+    pending = None
+    batch, size = [], 0
+
+    def collect(future):
+        nonlocal scanner
+        scanner, questions = future.result()
+        emitted.extend(questions)
+        return questions
+
+    for chunk in chunks:
+        batch.append(chunk)
+        size += len(chunk)
+        if size < batch_chars:
+            continue
+        if pending is not None:
+            yield from collect(pending)
+        pending = executor.submit(_scan_batch, scanner, ''.join(batch))
+        batch, size = [], 0
+    if pending is not None:
+        yield from collect(pending)
+    yield from collect(executor.submit(_scan_batch, scanner, ''.join(batch), True))
+
+    _apply_answer_key(emitted, scanner.answer_key)
+    print(f"DEBUG: Scanner parsed {len(emitted)} questions, {len(scanner.answer_key)} answers")
+
+def iter_questions(chunks, time_budget: float = None):
+    """Incrementally parse an iterable of text chunks (PDF pages, message parts).
+
+    Chunks are concatenated as-is, so pass page breaks as newlines. Each
+    Question is yielded as soon as the next question number shows it is
+    complete. Answers from the 'Answer Key:' section are filled in on the
+    yielded questions once the input is exhausted.
+    """
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    yield from _scan_questions(chunks, deadline)
+
+def parse_questions(text: str, legacy: bool = False, time_budget: float = DEFAULT_TIME_BUDGET):
+    """Parse numbered MCQ text into a list of Question objects.
+
+    The single-pass scanner is used by default; ``legacy=True`` runs the old
+    split + choice-cascade parser so the two can be compared. Parsing that runs
+    longer than ``time_budget`` seconds raises ParseTimeoutError (``None``
+    disables the budget).
+    """
     if not text or not isinstance(text, str):
         raise ValueError("Input must be a non-empty string")
 
@@ -157,14 +517,92 @@ def parse_questions(text: str):
     if not text:
         raise ValueError("Input contains no valid questions")
 
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    if legacy:
+        questions = _parse_questions_legacy(text, deadline)
+    else:
+        questions = list(_scan_questions([text], deadline))
+
+    if not questions:
+        raise ValueError("No valid questions found in the input")
+
+    return questions
+
+def split_at_questions(text: str, parts: int) -> list:
+    """Cut text into about `parts` pieces, each starting at a question number
+    line, without parsing it. Joining the pieces gives back the text."""
+    pieces = []
+    start = 0
+    step = max(len(text) // max(parts, 1), 1)
+    while len(pieces) < parts - 1:
+        match = QUESTION_BOUNDARY_RE.search(text, start + step)
+        if not match:
+            break
+        pieces.append(text[start:match.start() + 1])
+        start = match.start() + 1
+    pieces.append(text[start:])
+    return pieces
+
+def _parse_chunk(chunk: str, time_budget) -> list:
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    return list(_scan_questions([chunk], deadline))
+
+def parse_questions_parallel(text: str, workers: int = None, min_chars: int = PARALLEL_MIN_CHARS,
+                             time_budget: float = DEFAULT_TIME_BUDGET, executor=None):
+    """parse_questions() for very large documents, spread over processes.
+
+    The answer key is located first, the body is cut at question boundaries
+    and the pieces are scanned on a ProcessPoolExecutor (``executor`` if given,
+    else a temporary pool of ``workers`` processes). Results are merged in
+    document order and the answer key applied, giving the same list as the
+    serial parser. Texts under ``min_chars`` are parsed serially; when an
+    executor is given that happens as a single task on it, so the calling
+    thread never does the parsing itself.
+    """
+    workers = workers or os.cpu_count() or 1
+    if not text or not isinstance(text, str) or len(text) < min_chars or workers < 2:
+        if executor is not None:
+            return executor.submit(parse_questions, text, time_budget=time_budget).result()
+        return parse_questions(text, time_budget=time_budget)
+
+    text = text.strip()
+    key = find_answer_key(text)
+    # A few pieces per worker keeps the pool busy when question sizes vary
+    chunks = split_at_questions(text[:key.start], workers * 4)
+    print(f"DEBUG: Parallel parse of {len(text)} characters in {len(chunks)} chunks")
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        results = executor.map(_parse_chunk, chunks, [time_budget] * len(chunks), timeout=time_budget)
+        questions = [question for chunk_questions in results for question in chunk_questions]
+    except FuturesTimeoutError:
+        raise ParseTimeoutError("Document took too long to parse. Please send fewer questions at a time.")
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+    for question in questions:
+        correct_letter = key.answers.get(question.number)
+        if correct_letter:
+            question.set_correct_letter(correct_letter)
+
+    if not questions:
+        raise ValueError("No valid questions found in the input")
+
+    return questions
+
+def _parse_questions_legacy(text: str, deadline=None) -> list:
     print(f"DEBUG: Starting to parse text with {len(text)} characters")
 
     # Extract answer key first
-    answer_key = extract_answer_key(text)
+    key = find_answer_key(text)
+    answer_key = key.answers
     print(f"DEBUG: Extracted answer key: {answer_key}")
 
-    # Remove answer key section from text to avoid confusion
-    text_without_answers = re.sub(r'Answer\s+Key\s*:.*$', '', text, flags=re.IGNORECASE | re.DOTALL).strip()
+    # Slice the answer key section off to avoid confusion
+    text_without_answers = text[:key.start].strip()
 
     # Split by numbered questions (1., 2., 3., etc.)
     question_pattern = r'\n\s*(\d+)\.\s*'
@@ -177,6 +615,7 @@ def parse_questions(text: str):
     # Skip the first part (usually intro text like "Example layout:")
     i = 1
     while i < len(parts) - 1:
+        _check_deadline(deadline)
         question_num = parts[i]
         question_content = parts[i + 1]
         
@@ -205,37 +644,19 @@ def parse_questions(text: str):
         # If still no choices, create default ones
         if not choices:
             print("DEBUG: BULLETPROOF PARSER FAILED - Using defaults")
-            choices = [
-                "A. Option 1",
-                "B. Option 2", 
-                "C. Option 3",
-                "D. Option 4"
-            ]
+            choices = DEFAULT_CHOICES
+        else:
+            choices = tuple(Choice.from_string(choice, idx) for idx, choice in enumerate(choices))
         
         print(f"DEBUG: Final choices for question {question_num}: {choices}")
         
         # Create question object
-        q_type = detect_question_type(question_text)
-        question_obj = {
-            "text": question_text,
-            "type": q_type,
-            "choices": choices,
-            "correct_letter": "",
-            "correct_text": "",
-            "correct_answers": []
-        }
+        q_num = int(question_num)
+        question_obj = Question(question_text, detect_question_type(question_text), choices, number=q_num)
         
         # Add correct answer if available
-        q_num = int(question_num)
         if q_num in answer_key:
-            correct_letter = answer_key[q_num]
-            question_obj["correct_letter"] = correct_letter
-            
-            # Find the correct text
-            for choice in choices:
-                if choice.startswith(f"{correct_letter}."):
-                    question_obj["correct_text"] = choice[2:].strip()
-                    break
+            question_obj.set_correct_letter(answer_key[q_num])
         
         questions.append(question_obj)
         print(f"DEBUG: ===== QUESTION {question_num} COMPLETE =====\n")
@@ -244,9 +665,6 @@ def parse_questions(text: str):
 
     print(f"DEBUG: Final result: {len(questions)} questions parsed")
 
-    if not questions:
-        raise ValueError("No valid questions found in the input")
-
     return questions
 
 def format_choices(text: str) -> list:
@@ -268,38 +686,48 @@ def format_choices(text: str) -> list:
     
     return choices
 
-def extract_answers_from_text(text: str) -> dict:
-    """Extract answers that might be separated from questions"""
-    answer_patterns = [
-        r'answer[s]?\s*:?\s*([^\n]+)',
-        r'correct\s*:?\s*([^\n]+)',
-        r'ans\s*:?\s*([^\n]+)',
-        r'solution\s*:?\s*([^\n]+)',
-        r'key\s*:?\s*([^\n]+)'
-    ]
-    
+# Labels the line-based fallback of extract_answers_from_text strips from '3. Answer: b'
+ANSWER_LINE_RE = re.compile(r'^(\d+)[\.\)\-\s]*(.+)')
+ANSWER_LABEL_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'answer[s]?\s*:?\s*([^\n]+)',
+    r'correct\s*:?\s*([^\n]+)',
+    r'ans\s*:?\s*([^\n]+)',
+    r'solution\s*:?\s*([^\n]+)',
+    r'key\s*:?\s*([^\n]+)'
+))
+
+def _extract_answer_lines(text: str) -> dict:
+    """Bare 'N. answer' lines, e.g. a key pasted without an 'Answer Key:' heading"""
     answers = {}
-    lines = text.split('\n')
-    
-    for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
-        
-        # Look for question numbers followed by answers
-        question_match = re.match(r'^(\d+)[\.\)\-\s]*(.+)', line_lower)
-        if question_match:
-            q_num = int(question_match.group(1))
-            answer_text = question_match.group(2).strip()
-            
-            # Check if this looks like an answer
-            for pattern in answer_patterns:
-                if re.search(pattern, answer_text, re.IGNORECASE):
-                    answer_content = re.sub(pattern, '', answer_text, flags=re.IGNORECASE).strip()
-                    if answer_content:
-                        answers[q_num] = answer_content
-                    break
-            else:
-                # Direct answer format like "1. A" or "1. True"
-                if len(answer_text) <= 10:  # Short answers are likely answer keys
-                    answers[q_num] = answer_text
-    
+    for line in text.split('\n'):
+        question_match = ANSWER_LINE_RE.match(line.lower().strip())
+        if not question_match:
+            continue
+        q_num = int(question_match.group(1))
+        answer_text = question_match.group(2).strip()
+
+        # Check if this looks like an answer
+        for pattern in ANSWER_LABEL_RES:
+            if pattern.search(answer_text):
+                answer_content = pattern.sub('', answer_text).strip()
+                if answer_content:
+                    answers[q_num] = answer_content
+                break
+        else:
+            # Direct answer format like "1. A" or "1. True"
+            if len(answer_text) <= 10:  # Short answers are likely answer keys
+                answers[q_num] = answer_text
     return answers
+
+def extract_answers_from_text(text: str) -> dict:
+    """Extract answers that might be separated from questions.
+
+    Uses the same engine as the parser, so both the 'Answer Key:' section and
+    inline 'Answer:'/'Correct:' lines are found in one scan and come back as
+    {question number: letter}. Text the engine finds no answers in, such as a
+    bare '1. A\\n2. C' key, is read line by line as before: {1: 'a', 2: 'c'}.
+    """
+    # Materialise first: answer key entries land only after the last question
+    questions = list(iter_questions([text]))
+    answers = {q.number: q.correct_letter for q in questions if q.correct_letter}
+    return answers or _extract_answer_lines(text)
@@ -0,0 +1,182 @@
+"""
+Persistent on-disk cache of processed PDFs.
+
+Entries are keyed by a hash of the PDF bytes and hold the parsed questions
+and the extraction stats (not the text, which nothing reads back, so the
+document never has to be held in memory whole). Telegram's file_unique_id is stored as an alias of
+that hash, so a repeat upload of the same file skips the download as well
+as the extraction; a different file with identical content is still found
+by its hash after downloading.
+
+Each entry also records the PDF backend and page cap it was extracted
+with; an entry made under different settings is a miss, so changing
+PDF_BACKEND or PDF_MAX_PAGES takes effect for files seen before.
+
+    cache/
+      entries/<sha256>.json    questions + stats + extraction settings
+      ids/<hashed file id>     sha256 of the content it maps to
+
+Entries are evicted least-recently-used once the total size exceeds
+max_bytes, and after max_age seconds without a hit.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from parser import Question
+
+# Bump when the entry layout or the parser output changes; older entries
+# are then treated as misses.
+CACHE_VERSION = 3
+
+def content_hash(data) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+class PdfCache:
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, max_age=30 * 24 * 3600, backend=None, max_pages=None):
+        self.directory = directory
+        self.backend = backend
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._entries_dir = os.path.join(directory, 'entries')
+        self._ids_dir = os.path.join(directory, 'ids')
+        os.makedirs(self._entries_dir, exist_ok=True)
+        os.makedirs(self._ids_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _entry_path(self, digest):
+        return os.path.join(self._entries_dir, f"{digest}.json")
+
+    def _id_path(self, file_unique_id):
+        name = hashlib.blake2b(file_unique_id.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self._ids_dir, name)
+
+    @staticmethod
+    def _write_atomic(path, data: str):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _is_fresh(self, path):
+        return time.time() - os.path.getmtime(path) <= self.max_age
+
+    def _load(self, digest):
+        path = self._entry_path(digest)
+        try:
+            if not self._is_fresh(path):
+                os.remove(path)
+                return None
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        if (entry.get("version") != CACHE_VERSION or entry.get("backend") != self.backend
+                or entry.get("max_pages") != self.max_pages):
+            return None
+        return {
+            "questions": [Question.from_dict(data) for data in entry["questions"]],
+            "stats": entry["stats"],
+        }
+
+    def lookup_id(self, file_unique_id):
+        """Content hash previously seen for a Telegram file_unique_id"""
+        path = self._id_path(file_unique_id)
+        try:
+            with open(path, encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def get(self, file_unique_id=None, digest=None):
+        """{"questions", "stats"} for a file id or content hash, or None.
+
+        A hit by content hash also records file_unique_id as an alias, so
+        the next upload of that file is found without downloading it.
+        """
+        with self._lock:
+            result = None
+            id_digest = self.lookup_id(file_unique_id) if file_unique_id else None
+            if id_digest:
+                result = self._load(id_digest)
+                if result is None:
+                    # Entry was evicted or made with other settings; the alias is stale
+                    try:
+                        os.remove(self._id_path(file_unique_id))
+                    except OSError:
+                        pass
+            if result is None and digest:
+                result = self._load(digest)
+                if result is not None and file_unique_id:
+                    self._write_atomic(self._id_path(file_unique_id), digest)
+
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return result
+
+    def put(self, digest, questions, stats, file_unique_id=None):
+        entry = {
+            "version": CACHE_VERSION,
+            "backend": self.backend,
+            "max_pages": self.max_pages,
+            "questions": [question.to_dict() for question in questions],
+            "stats": stats,
+            "created": time.time(),
+        }
+        with self._lock:
+            self._write_atomic(self._entry_path(digest), json.dumps(entry, ensure_ascii=False))
+            if file_unique_id:
+                self._write_atomic(self._id_path(file_unique_id), digest)
+            self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones over max_bytes"""
+        now = time.time()
+        entries = []
+        total = 0
+        for name in os.listdir(self._entries_dir):
+            path = os.path.join(self._entries_dir, name)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            if now - info.st_mtime > self.max_age:
+                self._remove(path)
+                continue
+            entries.append((info.st_mtime, info.st_size, path))
+            total += info.st_size
+
+        entries.sort()
+        while total > self.max_bytes and entries:
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total -= size
+
+        # Aliases are tiny; just keep them from outliving their entries forever
+        for name in os.listdir(self._ids_dir):
+            path = os.path.join(self._ids_dir, name)
+            try:
+                if now - os.path.getmtime(path) > self.max_age:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            self.evictions += 1
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
@@ -0,0 +1,293 @@
+"""
+PDF text extraction shared by the bot and the batch converter.
+
+Large PDFs are split into page ranges that are extracted on a process pool
+and put back together in page order. Pages are produced lazily, so they can
+be fed into the streaming parser as they arrive.
+
+Text comes from a pluggable backend: PyPDF2 by default, or pypdfium2 /
+pdfminer.six when they are installed (``python benchmark.py pdf`` compares
+them). Backends are passed around by name so worker processes can look
+them up again.
+"""
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from multiprocessing import shared_memory
+
+from PyPDF2 import PdfReader
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+try:
+    from pdfminer.high_level import extract_pages as pdfminer_extract_pages
+    from pdfminer.layout import LTTextContainer
+    from pdfminer.pdfpage import PDFPage
+except ImportError:
+    pdfminer_extract_pages = None
+
+from parser import iter_questions, iter_questions_on
+
+# PDFs with fewer pages than this are extracted serially; below it the pool
+# start-up and re-opening the PDF in each worker cost more than they save.
+PARALLEL_MIN_PAGES = 40
+
+# Upper bound on pages per pool task, so progress keeps moving and only a
+# few ranges of text are ever waiting to be consumed.
+MAX_RANGE_PAGES = 16
+
+DEFAULT_BACKEND = 'pypdf2'
+
+def _as_stream(source):
+    """Binary stream for a path or the raw PDF bytes"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+def _open_reader(source):
+    """PdfReader for a path, a binary file object or the raw PDF bytes"""
+    return PdfReader(_as_stream(source))
+
+class PdfBackend:
+    """Text extraction backend. source is a path or the PDF bytes."""
+    name = ''
+
+    def available(self) -> bool:
+        return True
+
+    def page_count(self, source) -> int:
+        raise NotImplementedError
+
+    def iter_pages(self, source, start, stop):
+        """Yield the text of pages [start, stop)"""
+        raise NotImplementedError
+
+class PyPDF2Backend(PdfBackend):
+    name = 'pypdf2'
+
+    def page_count(self, source) -> int:
+        return len(_open_reader(source).pages)
+
+    def iter_pages(self, source, start, stop):
+        reader = _open_reader(source)
+        for i in range(start, stop):
+            yield reader.pages[i].extract_text() or ''
+
+class PdfiumBackend(PdfBackend):
+    """pypdfium2: PDFium's C text extraction, much faster than pure Python"""
+    name = 'pypdfium2'
+
+    def available(self) -> bool:
+        return pypdfium2 is not None
+
+    def page_count(self, source) -> int:
+        document = pypdfium2.PdfDocument(source)
+        try:
+            return len(document)
+        finally:
+            document.close()
+
+    def iter_pages(self, source, start, stop):
+        document = pypdfium2.PdfDocument(source)
+        try:
+            for i in range(start, stop):
+                page = document[i]
+                text_page = page.get_textpage()
+                try:
+                    # PDFium ends lines with \r\n; the parser splits on \n
+                    yield text_page.get_text_range().replace('\r\n', '\n')
+                finally:
+                    text_page.close()
+                    page.close()
+        finally:
+            document.close()
+
+class PdfminerBackend(PdfBackend):
+    """pdfminer.six: slower, but its layout analysis keeps columns apart"""
+    name = 'pdfminer'
+
+    def available(self) -> bool:
+        return pdfminer_extract_pages is not None
+
+    def page_count(self, source) -> int:
+        return sum(1 for _ in PDFPage.get_pages(_as_stream(source)))
+
+    def iter_pages(self, source, start, stop):
+        for layout in pdfminer_extract_pages(_as_stream(source), page_numbers=range(start, stop)):
+            yield ''.join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+
+BACKENDS = {backend.name: backend for backend in (PyPDF2Backend(), PdfiumBackend(), PdfminerBackend())}
+
+def available_backends() -> list:
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+def get_backend(name=None) -> PdfBackend:
+    """Backend by name; a known backend that is not installed falls back to the default"""
+    name = (name or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend {name!r} (choose from {', '.join(BACKENDS)})")
+    backend = BACKENDS[name]
+    if not backend.available():
+        print(f"⚠️ PDF backend {name} is not installed, using {DEFAULT_BACKEND}")
+        backend = BACKENDS[DEFAULT_BACKEND]
+    return backend
+
+class SharedPdf:
+    """Reference to PDF bytes in shared memory, sent to workers instead of
+    the bytes, so a big upload crosses into the pool once rather than with
+    every page range"""
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+    def read(self) -> bytes:
+        block = shared_memory.SharedMemory(name=self.name)
+        try:
+            return bytes(block.buf[:self.size])
+        finally:
+            block.close()
+
+def _extract_page_range(source, start, stop, backend=DEFAULT_BACKEND) -> list:
+    """Text of pages [start, stop); runs in a worker process"""
+    if isinstance(source, SharedPdf):
+        source = source.read()
+    return list(BACKENDS[backend].iter_pages(source, start, stop))
+
+def count_pdf_pages(source, backend=None) -> int:
+    return get_backend(backend).page_count(source)
+
+def iter_pdf_pages(source, workers=None, min_pages=PARALLEL_MIN_PAGES, executor=None, max_pages=None,
+                   backend=None):
+    """Yield the text of each page in page order, stopping after max_pages.
+
+    source is a path, the PDF bytes or a binary file object. PDFs with at
+    least min_pages pages are extracted in page ranges on a
+    ProcessPoolExecutor (``executor`` if given, else a temporary pool when
+    there is more than one worker), with only a window of ranges in flight.
+    Smaller PDFs are extracted in-process, or as a single task when an
+    executor is given. backend names the text backend (default PyPDF2).
+    """
+    if hasattr(source, 'read'):
+        # Workers need something picklable
+        source = source.read()
+
+    backend = get_backend(backend)
+    page_count = backend.page_count(source)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    workers = workers or os.cpu_count() or 1
+
+    if executor is None and (page_count < min_pages or workers < 2):
+        yield from backend.iter_pages(source, 0, page_count)
+        return
+
+    if page_count < min_pages:
+        range_size = max(page_count, 1)
+    else:
+        # A couple of ranges per worker evens out pages of very different weight
+        range_size = min(-(-page_count // (workers * 2)), MAX_RANGE_PAGES)
+    ranges = iter([(start, min(start + range_size, page_count)) for start in range(0, page_count, range_size)])
+    window = max(workers * 2, 2)
+    print(f"Extracting {page_count} pages with {backend.name} in ranges of {range_size} on {workers} workers")
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    block = None
+    task_source = source
+    if isinstance(source, (bytes, bytearray, memoryview)) and len(source):
+        block = shared_memory.SharedMemory(create=True, size=len(source))
+        block.buf[:len(source)] = source
+        task_source = SharedPdf(block.name, len(source))
+    pending = deque()
+    try:
+        for start, stop in ranges:
+            pending.append(executor.submit(_extract_page_range, task_source, start, stop, backend.name))
+            if len(pending) >= window:
+                break
+        # Futures are consumed in submission order, i.e. page order
+        while pending:
+            pages = pending.popleft().result()
+            next_range = next(ranges, None)
+            if next_range:
+                pending.append(executor.submit(_extract_page_range, task_source, *next_range, backend.name))
+            yield from pages
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+        if block is not None:
+            # Ranges still running keep their own mapping until they close it
+            block.close()
+            block.unlink()
+
+def extract_pdf_pages(source, workers=None, min_pages=PARALLEL_MIN_PAGES, executor=None, backend=None) -> list:
+    """Text of every page, in order (see iter_pdf_pages)"""
+    return list(iter_pdf_pages(source, workers, min_pages, executor, backend=backend))
+
+def extract_pdf_text(source, workers=None, min_pages=PARALLEL_MIN_PAGES, executor=None, backend=None) -> str:
+    """Whole-document text with pages joined by newlines"""
+    return '\n'.join(iter_pdf_pages(source, workers, min_pages, executor, backend=backend))
+
+def stream_pdf_questions(source, max_pages=None, max_seconds=None, on_progress=None,
+                         workers=None, min_pages=PARALLEL_MIN_PAGES, executor=None, backend=None):
+    """Extract pages lazily and parse them as they arrive.
+
+    Only a batch of pages and the question being read are held, never the
+    whole document text. Given an executor, both the extraction and the
+    parsing run on it. Stops after max_pages pages or max_seconds
+    seconds and returns what was found so far. on_progress(stats) is called
+    after every page. Returns (questions, stats) where stats holds
+    page_count, pages_done, chars, questions_found, truncated,
+    stop_reason ('pages' or 'time') and the backend used.
+    """
+    if hasattr(source, 'read'):
+        source = source.read()
+
+    started = time.monotonic()
+    backend = get_backend(backend).name
+    page_count = count_pdf_pages(source, backend)
+    stats = {
+        "page_count": page_count,
+        "pages_done": 0,
+        "chars": 0,
+        "questions_found": 0,
+        "truncated": False,
+        "stop_reason": "",
+        "backend": backend,
+    }
+    questions = []
+    page_limit = page_count if max_pages is None else min(page_count, max_pages)
+
+    def pages():
+        with closing(iter_pdf_pages(source, workers, min_pages, executor, page_limit, backend)) as page_texts:
+            for page_text in page_texts:
+                stats["pages_done"] += 1
+                stats["chars"] += len(page_text)
+                stats["questions_found"] = len(questions)
+                if on_progress:
+                    on_progress(stats)
+                yield page_text + '\n'
+                if max_seconds is not None and time.monotonic() - started > max_seconds and stats["pages_done"] < page_limit:
+                    stats["truncated"] = True
+                    stats["stop_reason"] = "time"
+                    return
+
+    # With a pool, the scanning runs there too; this thread only moves text
+    scanned = iter_questions_on(executor, pages()) if executor is not None else iter_questions(pages())
+    for question in scanned:
+        questions.append(question)
+
+    if page_limit < page_count and not stats["truncated"]:
+        stats["truncated"] = True
+        stats["stop_reason"] = "pages"
+    stats["questions_found"] = len(questions)
+    return questions, stats
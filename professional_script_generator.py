@@ -1,6 +1,7 @@
 """
 FIXED Google Apps Script generator - Multi-message approach
 """
+from parser import QuestionType
 
 def generate_simple_apps_script(questions, form_title="Exam Questions"):
     """Generate a working Google Apps Script - optimized for length"""
@@ -8,7 +9,7 @@ def generate_simple_apps_script(questions, form_title="Exam Questions"):
     safe_title = form_title.replace('"', '\\"')
     
     # Filter only MCQ questions
-    mcq_questions = [q for q in questions if q["type"].name == "MULTIPLE_CHOICE"]
+    mcq_questions = [q for q in questions if q.type == QuestionType.MULTIPLE_CHOICE]
     
     script = f'''function createForm() {{
   var form = FormApp.create("{safe_title}");
@@ -19,30 +20,18 @@ def generate_simple_apps_script(questions, form_title="Exam Questions"):
 
     # Add questions - COMPACT but complete
     for idx, q in enumerate(mcq_questions, start=1):
-        question_text = q['text'].replace('"', '\\"').replace('\n', ' ')
-        choices = q.get("choices", [])
-        correct_letter = q.get("correct_letter", "")
+        question_text = q.text.replace('"', '\\"').replace('\n', ' ')
         
         script += f'''  var q{idx} = form.addMultipleChoiceItem();
   q{idx}.setTitle("{question_text}").setRequired(true).setPoints(1);
   var choices{idx} = ['''
         
-        # Add choices and track correct one
+        # Add choices; the parser already resolved the correct one
         choice_parts = []
-        correct_index = -1
-        
-        for i, choice in enumerate(choices):
-            if choice.startswith(('A.', 'B.', 'C.', 'D.')):
-                choice_letter = choice[0]
-                choice_text = choice[2:].strip().replace('"', '\\"')
-            else:
-                choice_text = choice.strip().replace('"', '\\"')
-                choice_letter = chr(65 + i)
-            
-            if choice_text:
-                choice_parts.append(f'q{idx}.createChoice("{choice_text}")')
-                if correct_letter and choice_letter.upper() == correct_letter.upper():
-                    correct_index = i
+        for choice in q.choices:
+            choice_text = choice.text.replace('"', '\\"')
+            choice_parts.append(f'q{idx}.createChoice("{choice_text}")')
+        correct_index = q.correct_index
         
         script += ', '.join(choice_parts)
         script += f'''];
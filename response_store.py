@@ -0,0 +1,118 @@
+"""
+Local copy of form responses, kept up to date incrementally.
+
+A sync only asks for responses submitted since the newest one already
+stored, follows the pages and upserts them, so polling a 2,000-respondent
+exam downloads just the new submissions.
+
+    store = ResponseStore('.cache/responses.sqlite3')
+    new = await store.sync_async(form_id)
+    rows = store.responses(form_id)
+"""
+import datetime
+import json
+import time
+
+from google_forms_api import iter_form_responses
+from google_forms_async import iter_form_responses_async
+from offload import run_io
+from sqlite_store import SqliteStore
+
+# Re-read this many seconds before the newest stored response, so a
+# submission indexed late with an older timestamp is still picked up
+# (upserts make the overlap free of duplicates)
+SYNC_OVERLAP = 60
+
+# Responses written per transaction while syncing
+SAVE_BATCH = 500
+
+def _since(last_seen, overlap=SYNC_OVERLAP):
+    if not last_seen:
+        return None
+    # lastSubmittedTime may carry up to nanoseconds; whole seconds are enough
+    seen = datetime.datetime.strptime(last_seen[:19], '%Y-%m-%dT%H:%M:%S')
+    return (seen - datetime.timedelta(seconds=overlap)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class ResponseStore(SqliteStore):
+    def __init__(self, path):
+        super().__init__(path)
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " form_id TEXT NOT NULL, response_id TEXT NOT NULL, last_submitted TEXT, response TEXT NOT NULL,"
+                " PRIMARY KEY (form_id, response_id))"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state (form_id TEXT PRIMARY KEY, last_seen TEXT, synced REAL)"
+            )
+
+    def last_seen(self, form_id):
+        """lastSubmittedTime of the newest stored response, or None"""
+        with self._lock:
+            row = self._db.execute("SELECT last_seen FROM sync_state WHERE form_id = ?", (form_id,)).fetchone()
+        return row[0] if row else None
+
+    def save(self, form_id, responses):
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                [(form_id, response['responseId'], response.get('lastSubmittedTime'), json.dumps(response))
+                 for response in responses]
+            )
+
+    def _finish(self, form_id, newest):
+        # Only a completed sync moves the mark: pages are not in time order,
+        # so an interrupted one must be repeated from the old mark
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO sync_state VALUES (?, ?, ?) ON CONFLICT (form_id) DO UPDATE SET"
+                " last_seen = max(coalesce(last_seen, ''), coalesce(excluded.last_seen, '')), synced = excluded.synced",
+                (form_id, newest, time.time())
+            )
+
+    def responses(self, form_id) -> list:
+        """All stored responses of a form, oldest submission first"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT response FROM responses WHERE form_id = ? ORDER BY last_submitted", (form_id,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, form_id) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses WHERE form_id = ?", (form_id,)).fetchone()[0]
+
+    def sync(self, form_id, user=None) -> int:
+        """Fetch and store responses newer than the last sync (all of them the
+        first time); returns how many were fetched"""
+        fetched, newest, batch = 0, None, []
+        since = _since(self.last_seen(form_id))
+        for response in iter_form_responses(form_id, since, user=user):
+            batch.append(response)
+            newest = max(newest or '', response.get('lastSubmittedTime', ''))
+            if len(batch) >= SAVE_BATCH:
+                self.save(form_id, batch)
+                fetched += len(batch)
+                batch = []
+        self.save(form_id, batch)
+        fetched += len(batch)
+        self._finish(form_id, newest)
+        print(f"Synced form {form_id}: {fetched} responses fetched since {since or 'the start'}")
+        return fetched
+
+    async def sync_async(self, form_id, user=None) -> int:
+        """asyncio version of sync; the database work runs in the offload threads"""
+        fetched, newest, batch = 0, None, []
+        since = _since(await run_io(self.last_seen, form_id))
+        async for response in iter_form_responses_async(form_id, since, user=user):
+            batch.append(response)
+            newest = max(newest or '', response.get('lastSubmittedTime', ''))
+            if len(batch) >= SAVE_BATCH:
+                await run_io(self.save, form_id, batch)
+                fetched += len(batch)
+                batch = []
+        await run_io(self.save, form_id, batch)
+        fetched += len(batch)
+        await run_io(self._finish, form_id, newest)
+        print(f"Synced form {form_id}: {fetched} responses fetched since {since or 'the start'}")
+        return fetched
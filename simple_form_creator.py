@@ -2,6 +2,7 @@
 Simple form creator that generates a shareable Google Apps Script
 This is a fallback method if the API approach continues to have issues
 """
+from parser import QuestionType
 
 def generate_apps_script_with_sharing(questions, form_title="Exam Questions"):
     """Generate Google Apps Script that creates and shares a form"""
@@ -18,9 +19,9 @@ def generate_apps_script_with_sharing(questions, form_title="Exam Questions"):
 
     # Add questions to script
     for idx, q in enumerate(questions, start=1):
-        question_title = q['text'].replace('"', '\\"')
+        question_title = q.text.replace('"', '\\"')
         
-        if q["type"].name == "TRUE_FALSE":
+        if q.type == QuestionType.TRUE_FALSE:
             script += f'''
   // Question {idx}: True/False
   var item{idx} = form.addMultipleChoiceItem();
@@ -31,13 +32,10 @@ def generate_apps_script_with_sharing(questions, form_title="Exam Questions"):
       ]);
 '''
 
-        elif q["type"].name == "MULTIPLE_CHOICE":
+        elif q.type == QuestionType.MULTIPLE_CHOICE:
             choices_code = []
-            for choice in q.get("choices", []):
-                if choice.startswith(('A.', 'B.', 'C.', 'D.')):
-                    choice_text = choice[2:].strip().replace('"', '\\"')
-                else:
-                    choice_text = choice.strip().replace('"', '\\"')
+            for choice in q.choices:
+                choice_text = choice.text.replace('"', '\\"')
                 choices_code.append(f'item{idx}.createChoice("{choice_text}")')
             
             choices_str = ',\n          '.join(choices_code)
@@ -51,13 +49,10 @@ def generate_apps_script_with_sharing(questions, form_title="Exam Questions"):
       ]);
 '''
 
-        elif q["type"].name == "CHECKBOX":
+        elif q.type == QuestionType.CHECKBOX:
             choices_code = []
-            for choice in q.get("choices", []):
-                if choice.startswith(('A.', 'B.', 'C.', 'D.')):
-                    choice_text = choice[2:].strip().replace('"', '\\"')
-                else:
-                    choice_text = choice.strip().replace('"', '\\"')
+            for choice in q.choices:
+                choice_text = choice.text.replace('"', '\\"')
                 choices_code.append(f'item{idx}.createChoice("{choice_text}")')
             
             choices_str = ',\n          '.join(choices_code)
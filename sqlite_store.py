@@ -0,0 +1,26 @@
+"""
+Base class for the bot's small SQLite stores (form_registry, response_store).
+
+The handlers reach a store through run_io, so its methods run on the
+offload threads: they share one connection, serialised by a lock.
+
+    class MyStore(SqliteStore):
+        def count(self):
+            with self._lock:
+                return self._db.execute("SELECT COUNT(*) FROM things").fetchone()[0]
+"""
+import os
+import sqlite3
+import threading
+
+class SqliteStore:
+    def __init__(self, path):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self._db.close()